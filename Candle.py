@@ -3,48 +3,16 @@ from tkinter import ttk, messagebox
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from datetime import datetime, timedelta
-from collections import defaultdict
-import os
+from datetime import datetime
+from analytics import ProgressAnalytics
 
 FILE_PATH = "Anti-Finger.txt"
 
+# ใช้สูตรเดียวกับ main.py: 5 ท่า = 1 ครั้ง, 10 ครั้ง = 1 เซ็ต, เป้าหมาย 30 ครั้งต่อวัน
+analytics = ProgressAnalytics(FILE_PATH)
+
 def get_history_from_file():
-    daily_counts = defaultdict(int)
-    if not os.path.exists(FILE_PATH):
-        return []
-
-    # อ่านไฟล์และนับจำนวนครั้งต่อวัน
-    with open(FILE_PATH, "r", encoding="utf-8") as f:
-        for line in f:
-            try:
-                date_str = line.split("]")[0][1:]
-                date = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-                daily_counts[date.date()] += 1
-            except:
-                continue
-
-    history = []
-    if not daily_counts:
-        return history
-
-    first_day = min(daily_counts.keys())
-    last_day = max(daily_counts.keys())
-    day = first_day
-    while day <= last_day:
-        count = daily_counts.get(day, 0)
-        sets_done = count // 10
-        progress = min((count / 30) * 100, 100) if count > 0 else 0
-        history.append({
-            'date': datetime.combine(day, datetime.min.time()),
-            'progress': progress,
-            'sets_done': sets_done,
-            'count': count
-        })
-        day += timedelta(days=1)
-
-    history.sort(key=lambda x: x['date'])
-    return history
+    return analytics.history(level="day")
 
 class ProgressChart:
     def __init__(self, parent, get_history_func):
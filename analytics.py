@@ -0,0 +1,115 @@
+import os
+from collections import OrderedDict
+from history_cache import DailyCountCache
+from history_series import bucket_start, build_series, choose_level, rollup
+from log_parser import parse_log
+
+# One log line is one successful pose; 5 poses make a rep, 10 reps a set,
+# and the daily target is 30 reps
+POSES_PER_REP = 5
+REPS_PER_SET = 10
+DAILY_TARGET_REPS = 30
+
+
+class ProgressAnalytics:
+    """Daily poses, reps, sets and progress for one exercise history, memoized.
+
+    Results are keyed on the source's identity and size: the log file's device,
+    inode, size and mtime, or the newest event id when a HistoryStore is used.
+    New lines change the key, so the next call recomputes; until then every
+    caller gets the cached result.
+
+    With sidecar=False a text log is parsed whole instead of through a
+    DailyCountCache, so nothing is written next to it.
+    """
+
+    def __init__(self, log_path, store=None, cache_size=32, sidecar=True):
+        self.log_path = log_path
+        self.store = store
+        self.cache_size = cache_size
+        self._log_cache = DailyCountCache(log_path) if store is None and sidecar else None
+        self._key = None
+        self._memo = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def source_key(self):
+        if self.store is not None:
+            return ("store", self.store.last_event_id())
+        try:
+            st = os.stat(self.log_path)
+        except OSError:
+            return ("missing", self.log_path)
+        return ("log", st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _cached(self, name, compute):
+        key = self.source_key()
+        if key != self._key:
+            self._memo.clear()
+            self._key = key
+        if name in self._memo:
+            self.hits += 1
+            self._memo.move_to_end(name)
+            return self._memo[name]
+        self.misses += 1
+        value = compute()
+        self._memo[name] = value
+        if len(self._memo) > self.cache_size:
+            self._memo.popitem(last=False)
+        return value
+
+    def daily(self):
+        """{date: poses} for every day with logged poses."""
+        def compute():
+            if self.store is not None:
+                return dict(self.store.daily_counts())
+            if not os.path.exists(self.log_path):
+                return {}
+            if self._log_cache is None:
+                return parse_log(self.log_path, fields=False).daily_counts()
+            return self._log_cache.counts()
+        return self._cached("daily", compute)
+
+    def date_range(self):
+        """(first, last) day with logged poses, or None."""
+        def compute():
+            if self.store is not None:
+                return self.store.date_range()
+            daily = self.daily()
+            return (min(daily), max(daily)) if daily else None
+        return self._cached("range", compute)
+
+    def buckets(self, level, start=None, end=None):
+        """{bucket start: (poses, active days)} at level, covering at least [start, end]."""
+        if self.store is None:
+            # The whole rollup is small and cheap to window, so keep one per level
+            return self._cached(("buckets", level), lambda: rollup(self.daily(), level))
+        start = bucket_start(start, level) if start is not None else None
+
+        def compute():
+            rows = self.store.bucket_counts(level, start, end)
+            return {key: (poses, active) for key, poses, active in rows}
+        return self._cached(("buckets", level, start, end), compute)
+
+    def history(self, start=None, end=None, level=None):
+        """Progress entries for [start, end] (default: all history) at day, week or month level.
+
+        Each entry has date, poses, reps, sets_done, progress, active_days and level.
+        The level is chosen from the span when not given. The range is clamped to
+        the logged days, so no empty buckets are made up before the first or after
+        the last entry.
+        """
+        full_range = self.date_range()
+        if full_range is None:
+            return []
+        start = max(start, full_range[0]) if start else full_range[0]
+        end = min(end, full_range[1]) if end else full_range[1]
+        if start > end:
+            return []
+        level = level or choose_level(start, end)
+
+        def compute():
+            return build_series(self.buckets(level, start, end), start, end, level, last_day=full_range[1],
+                                daily_target_reps=DAILY_TARGET_REPS, poses_per_rep=POSES_PER_REP,
+                                reps_per_set=REPS_PER_SET)
+        return self._cached(("history", start, end, level), compute)
@@ -0,0 +1,136 @@
+import heapq
+import os
+import threading
+import time
+import pygame
+from tracing import tracer
+
+# Lower plays first among queued prompts
+PRIORITY_CONTROL = 0
+PRIORITY_PROMPT = 1
+PRIORITY_NAVIGATION = 2
+
+
+class AudioEngine:
+    """Voice prompt player built on sounds decoded once.
+
+    Every file in the voice directory is decoded in the background at start-up.
+    One dispatcher thread plays queued prompts back to back on a reserved mixer
+    channel, so prompts never overlap and no thread is started per playback.
+    """
+
+    def __init__(self, directory="Voices", voice_channel=0):
+        self.directory = directory
+        self.sounds = {}
+        self.decode_ms = 0.0
+        self.played = 0
+        self.skipped = 0
+        self.enabled = bool(pygame.mixer.get_init())
+        self.loaded = threading.Event()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._queue = []
+        self._seq = 0
+        self._flushed = 0
+        self._closed = False
+        self.channel = None
+        if self.enabled:
+            # Keep the voice channel out of pygame's automatic channel pick
+            pygame.mixer.set_reserved(voice_channel + 1)
+            self.channel = pygame.mixer.Channel(voice_channel)
+            threading.Thread(target=self._preload, daemon=True).start()
+            self._dispatcher = threading.Thread(target=self._run, daemon=True)
+            self._dispatcher.start()
+        else:
+            self.loaded.set()
+
+    @staticmethod
+    def _name(filename):
+        return filename if filename.endswith(".mp3") else filename + ".mp3"
+
+    def _preload(self):
+        start = time.perf_counter()
+        try:
+            names = sorted(n for n in os.listdir(self.directory) if n.lower().endswith(".mp3"))
+        except OSError as e:
+            print(f"[Sound] {e}")
+            names = []
+        for name in names:
+            self._sound(name)
+        self.decode_ms = (time.perf_counter() - start) * 1000
+        self.loaded.set()
+
+    def _sound(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            path = os.path.join(self.directory, name)
+            if not os.path.exists(path):
+                return None
+            try:
+                with tracer.span("audio_decode", "audio", file=name):
+                    sound = pygame.mixer.Sound(path)
+            except Exception as e:
+                print(f"Sound error: {e}")
+                return None
+            self.sounds[name] = sound
+        return sound
+
+    def play(self, filename, priority=PRIORITY_PROMPT, interrupt=False):
+        """Queue a prompt. interrupt=True stops the current prompt and drops everything queued before it."""
+        if not self.enabled:
+            return
+        with self._cond:
+            if interrupt:
+                self._flushed = self._seq
+                self._queue.clear()
+                self.channel.stop()
+            self._seq += 1
+            heapq.heappush(self._queue, (priority, self._seq, self._name(filename), time.perf_counter()))
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or self._queue)
+                if self._closed:
+                    return
+                priority, seq, name, queued = heapq.heappop(self._queue)
+            sound = self._sound(name)
+            if sound is None:
+                self.skipped += 1
+                continue
+            with self._cond:
+                if seq <= self._flushed:
+                    self.skipped += 1
+                    continue
+                self.channel.play(sound)
+            self.played += 1
+            tracer.complete("audio_latency", queued, "audio", file=name)
+            # Wait for the prompt to finish; an interrupt stops the channel early
+            while not self._closed and self.channel.get_busy():
+                time.sleep(0.01)
+
+    def stop(self):
+        """Silence the current prompt and drop queued ones."""
+        if not self.enabled:
+            return
+        with self._cond:
+            self._flushed = self._seq
+            self._queue.clear()
+            self.channel.stop()
+
+    def close(self):
+        if not self.enabled:
+            return
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.channel.stop()
+
+    def stats(self):
+        return {
+            "decoded": len(self.sounds),
+            "decode_ms": round(self.decode_ms, 1),
+            "played": self.played,
+            "skipped": self.skipped,
+        }
@@ -0,0 +1,282 @@
+"""Render progress reports (chart and summary) for many exercise logs or patient profiles.
+
+    python batch_report.py --profiles profiles --format png pdf --out reports
+    python batch_report.py logs/*.txt --days 90 --workers 4
+
+Reports are rendered with the Agg backend in a process pool. A manifest in the
+output directory records each input's content hash, so inputs whose history
+and report options are unchanged are skipped on the next run.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timedelta
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.font_manager as fm
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import settings
+from analytics import ProgressAnalytics, DAILY_TARGET_REPS, POSES_PER_REP, REPS_PER_SET
+from history_series import choose_level
+from progress_chart import ProgressPlot
+
+# Bump when the report layout changes so every input is rendered again
+REPORT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+HERE = os.path.dirname(os.path.abspath(__file__))
+FONT_REGULAR = os.path.join(HERE, "Sarabun-Regular.ttf")
+FONT_BOLD = os.path.join(HERE, "Sarabun-Bold.ttf")
+
+
+def _font(path, size, fallback_weight="normal"):
+    if os.path.exists(path):
+        return fm.FontProperties(fname=path, size=size)
+    print(f"[Report] font {path} not found, using Tahoma")
+    return fm.FontProperties(family="Tahoma", size=size, weight=fallback_weight)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@contextmanager
+def store_snapshot(db_path):
+    """HistoryStore over a private copy of db_path and its WAL, so the input database is never touched.
+
+    Opening a WAL database in place, even read-only, creates -shm/-wal files next to it.
+    """
+    from history_store import HistoryStore
+    with tempfile.TemporaryDirectory(prefix="report-") as tmp:
+        copy = os.path.join(tmp, os.path.basename(db_path))
+        shutil.copyfile(db_path, copy)
+        if os.path.exists(db_path + "-wal"):
+            shutil.copyfile(db_path + "-wal", copy + "-wal")
+        store = HistoryStore(copy)
+        try:
+            yield store
+        finally:
+            store.close()
+
+
+def input_key(job, previous=None):
+    """Content hash of a job's history, plus the stat used to avoid re-hashing an untouched file."""
+    path = job["log_path"]
+    if not os.path.exists(path):
+        if not job.get("db_path") or not os.path.exists(job["db_path"]):
+            return None, None
+        # Store-only history (no text mirror): the newest event id identifies its content
+        with store_snapshot(job["db_path"]) as store:
+            return f"store:{store.last_event_id()}", None
+    st = os.stat(path)
+    stat = [st.st_size, st.st_mtime_ns]
+    if previous and previous.get("stat") == stat and previous.get("hash"):
+        return previous["hash"], stat
+    return file_digest(path), stat
+
+
+def summarize(analytics, start, end):
+    """Totals over [start, end] from the daily pose counts."""
+    daily = {d: n for d, n in analytics.daily().items() if start <= d <= end}
+    reps = {d: n // POSES_PER_REP for d, n in daily.items()}
+    days = (end - start).days + 1
+    streak = 0
+    day = end
+    while reps.get(day, 0) >= DAILY_TARGET_REPS:
+        streak += 1
+        day -= timedelta(days=1)
+    best = max(daily, key=daily.get) if daily else None
+    return {
+        "days": days,
+        "active_days": sum(1 for n in daily.values() if n),
+        "poses": sum(daily.values()),
+        "reps": sum(reps.values()),
+        "sets": sum(r // REPS_PER_SET for r in reps.values()),
+        "target_days": sum(1 for r in reps.values() if r >= DAILY_TARGET_REPS),
+        "mean_progress": sum(min(r / DAILY_TARGET_REPS * 100.0, 100.0) for r in reps.values()) / days,
+        "best_day": best,
+        "best_poses": daily.get(best, 0),
+        "streak": streak,
+    }
+
+
+def render_report(job):
+    """Draw one report and write it in every requested format. Runs in a worker process."""
+    use_store = not os.path.exists(job["log_path"]) and job.get("db_path") and os.path.exists(job["db_path"])
+    with store_snapshot(job["db_path"]) if use_store else nullcontext() as store:
+        # Input directories may be read-only or shared between workers, so no cache sidecar
+        analytics = ProgressAnalytics(job["log_path"], store, sidecar=False)
+        full_range = analytics.date_range()
+        if full_range is None:
+            return {"name": job["name"], "outputs": [], "empty": True}
+        end = full_range[1]
+        start = max(full_range[0], end - timedelta(days=job["days"] - 1)) if job["days"] else full_range[0]
+        level = choose_level(start, end)
+        history = analytics.history(start, end, level)
+        summary = summarize(analytics, start, end)
+
+    text_font = _font(FONT_REGULAR, 12)
+    label_font = _font(FONT_REGULAR, 14)
+    title_font = _font(FONT_BOLD, 16, "bold")
+    fig = Figure(figsize=(11, 6.5), dpi=job["dpi"])
+    FigureCanvasAgg(fig)
+    grid = fig.add_gridspec(2, 1, height_ratios=[3, 1])
+    plot = ProgressPlot(fig.add_subplot(grid[0]), label_font, title_font)
+    plot.set_history(history, xlim=(datetime.combine(start, datetime.min.time()) - timedelta(days=1),
+                                    datetime.combine(end, datetime.min.time()) + timedelta(days=1)), level=level)
+    plot.ax.set_title(f"สถิติของ {job['title']}", fontproperties=title_font)
+    fig.autofmt_xdate()
+
+    info = fig.add_subplot(grid[1])
+    info.axis("off")
+    best = summary["best_day"].strftime("%d-%b-%Y") if summary["best_day"] else "-"
+    lines = [
+        f"ช่วงเวลา {start:%d-%b-%Y} ถึง {end:%d-%b-%Y} ({summary['days']} วัน, ฝึก {summary['active_days']} วัน)",
+        f"ท่าสำเร็จ {summary['poses']} ท่า  |  {summary['reps']} ครั้ง  |  {summary['sets']} เซ็ต",
+        f"ความสำเร็จเฉลี่ย {summary['mean_progress']:.1f}%  |  ถึงเป้าหมาย {summary['target_days']} วัน"
+        f"  |  ต่อเนื่องล่าสุด {summary['streak']} วัน",
+        f"วันที่ดีที่สุด {best} ({summary['best_poses']} ท่า)",
+    ]
+    info.text(0.01, 0.95, "\n".join(lines), va="top", ha="left", fontproperties=text_font, linespacing=1.6)
+    fig.tight_layout()
+
+    outputs = []
+    for fmt in job["formats"]:
+        path = f"{job['out_base']}.{fmt}"
+        tmp = f"{job['out_base']}.tmp.{fmt}"
+        fig.savefig(tmp, format=fmt)
+        os.replace(tmp, path)
+        outputs.append(path)
+    return {"name": job["name"], "outputs": outputs, "empty": False}
+
+
+def profile_jobs(root):
+    from profiles import DB_NAME, DEFAULT_PROFILE, LOG_NAME, ProfileRegistry
+    # The app keeps the default profile at its legacy paths, relative to wherever it runs;
+    # here everything resolves under root, and a legacy log can be passed as a log file
+    default_dir = os.path.join(root, DEFAULT_PROFILE)
+    registry = ProfileRegistry(root, os.path.join(default_dir, LOG_NAME),
+                               os.path.join(default_dir, DB_NAME) if settings.HISTORY_DB else "")
+    for profile_id in registry.ids():
+        profile = registry.get(profile_id)
+        yield {"name": profile_id, "title": profile.name, "log_path": profile.log_path, "db_path": profile.db_path}
+
+
+def log_jobs(paths):
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        yield {"name": stem, "title": stem, "log_path": path, "db_path": ""}
+
+
+def load_manifest(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path, manifest):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render progress reports for exercise logs or patient profiles")
+    parser.add_argument("logs", nargs="*", help="exercise log files (Anti-Finger.txt format)")
+    parser.add_argument("--profiles", help="patient profiles directory; reports every profile in it (the default profile from <dir>/default/)")
+    parser.add_argument("--out", "-o", default="reports", help="output directory")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=["png", "pdf", "svg"], dest="formats")
+    parser.add_argument("--days", type=int, default=0, help="report the last N days of each history (0 = all)")
+    parser.add_argument("--dpi", type=int, default=120)
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true", help="render even if the input is unchanged")
+    args = parser.parse_args(argv)
+
+    jobs = list(log_jobs(args.logs))
+    if args.profiles and not os.path.isdir(args.profiles):
+        parser.error(f"profiles directory not found: {args.profiles}")
+    if args.profiles:
+        jobs.extend(profile_jobs(args.profiles))
+    if not jobs:
+        parser.error("give log files and/or --profiles")
+
+    os.makedirs(args.out, exist_ok=True)
+    manifest_path = os.path.join(args.out, MANIFEST_FILE)
+    manifest = load_manifest(manifest_path)
+    options = {"version": REPORT_VERSION, "formats": sorted(args.formats), "days": args.days, "dpi": args.dpi}
+
+    seen = {}
+    pending = []
+    skipped = 0
+    start_time = time.perf_counter()
+    for job in jobs:
+        # Same-named logs from different folders get numbered outputs
+        n = seen.get(job["name"], 0)
+        seen[job["name"]] = n + 1
+        if n:
+            job["name"] = f"{job['name']}-{n}"
+        job.update(days=args.days, dpi=args.dpi, formats=args.formats,
+                   out_base=os.path.join(args.out, job["name"]))
+        previous = manifest.get(job["name"])
+        try:
+            digest, stat = input_key(job, previous)
+        except Exception as e:
+            print(f"[Report] {job['name']}: {e}")
+            continue
+        if digest is None:
+            print(f"[Report] {job['name']}: no history, skipped")
+            continue
+        job["hash"], job["stat"] = digest, stat
+        if (not args.force and previous and previous.get("hash") == digest and previous.get("options") == options
+                and all(os.path.exists(p) for p in previous.get("outputs", []))):
+            skipped += 1
+            continue
+        pending.append(job)
+
+    rendered = failed = 0
+
+    def record(job, result):
+        nonlocal rendered
+        rendered += 1
+        manifest[job["name"]] = {"source": job["log_path"], "hash": job["hash"], "stat": job["stat"],
+                                 "options": options, "outputs": result["outputs"]}
+
+    workers = args.workers or os.cpu_count() or 1
+    if len(pending) <= 1 or workers == 1:
+        for job in pending:
+            try:
+                record(job, render_report(job))
+            except Exception as e:
+                failed += 1
+                print(f"[Report] {job['name']}: {e}")
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+            futures = {pool.submit(render_report, job): job for job in pending}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    record(job, future.result())
+                except Exception as e:
+                    failed += 1
+                    print(f"[Report] {job['name']}: {e}")
+    save_manifest(manifest_path, manifest)
+    print(f"[Report] {rendered} rendered, {skipped} unchanged, {failed} failed "
+          f"in {time.perf_counter() - start_time:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,257 @@
+"""Replay fixture clips through the detection pipeline and report per-stage timings as JSON.
+
+    python benchmark.py clips/pose1.mp4 clips/frames_dir --output bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import cv2
+import numpy as np
+import mediapipe as mp
+from PIL import Image
+from frame_source import open_frame_source
+from detection import HandDetector, hand_angles, draw_match
+from classifier import PoseClassifier
+from display import crop_and_resize, PreviewRenderer
+from roi import HandROITracker
+from cadence import InferenceCadence
+from inference_worker import InferenceWorkerClient
+
+# Same order as AntiTriggerFingersApp._mediapipe_loop. detect_other is what detect()
+# spends outside cvtColor and hands.process: ROI mapping, or the worker round trip.
+# Sub-stages are reported by HandDetector.detect() and PreviewRenderer.render().
+STAGES = [
+    "read", "flip", "cvt_color", "hands_process", "detect_other", "draw_landmarks",
+    "classify", "crop_resize", "display_convert", "imagetk",
+]
+DETECT_PARTS = ("cvt_color", "hands_process")
+PREVIEW_PARTS = ("crop_resize", "display_convert")
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples = {name: [] for name in STAGES}
+        self._last = 0.0
+
+    def start(self):
+        self._last = time.perf_counter()
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.samples[name].append((now - self._last) * 1000.0)
+        self._last = now
+
+    def split(self, parts, timings, rest=None):
+        """Record the time since the last mark as the given parts; whatever they miss goes to rest."""
+        now = time.perf_counter()
+        elapsed = (now - self._last) * 1000.0
+        for name in parts:
+            ms = timings.get(name, 0.0)
+            self.samples[name].append(ms)
+            elapsed -= ms
+        if rest is not None:
+            self.samples[rest].append(max(0.0, elapsed))
+        self._last = now
+
+
+def summarize(samples):
+    if not samples:
+        return None
+    arr = np.asarray(samples)
+    return {
+        "count": int(arr.size),
+        "mean_ms": float(arr.mean()),
+        "p50_ms": float(np.percentile(arr, 50)),
+        "p95_ms": float(np.percentile(arr, 95)),
+        "p99_ms": float(np.percentile(arr, 99)),
+        "max_ms": float(arr.max()),
+    }
+
+
+class TkHandoff:
+    """Mimics _update_camera_label: paste into one PhotoImage, or a new PhotoImage per frame (legacy)"""
+
+    def __init__(self, legacy=False):
+        self.legacy = legacy
+        import tkinter as tk
+        from PIL import ImageTk
+        self.ImageTk = ImageTk
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.label = tk.Label(self.root)
+        self.photo = None
+
+    def show(self, pil_img):
+        if not self.legacy and self.photo is not None and (self.photo.width(), self.photo.height()) == pil_img.size:
+            self.photo.paste(pil_img)
+            return
+        self.photo = self.ImageTk.PhotoImage(pil_img)
+        self.label.configure(image=self.photo)
+
+    def close(self):
+        self.root.destroy()
+
+
+def run_clip(path, args, handoff, poses):
+    source = open_frame_source(path, realtime=False, fps=args.fps)
+    if not source.isOpened():
+        return {"clip": path, "error": "cannot open"}
+
+    tracker = None
+    if args.worker:
+        detector = InferenceWorkerClient(roi_tracking=args.roi, roi_padding=args.roi_padding)
+    else:
+        tracker = HandROITracker(padding=args.roi_padding) if args.roi else None
+        detector = HandDetector(tracker=tracker)
+    cadence = InferenceCadence(stable_interval=args.stable_interval) if args.adaptive else None
+    hands = []
+    preview = PreviewRenderer(args.width, args.height)
+    timer = StageTimer()
+    frames = 0
+    detected = 0
+    matched = 0
+    wall_start = cpu_start = None
+    try:
+        while args.max_frames <= 0 or frames < args.max_frames + args.warmup:
+            if frames == args.warmup:
+                # Drop warm-up samples (model init, first allocations)
+                timer = StageTimer()
+                detected = matched = 0
+                wall_start = time.perf_counter()
+                cpu_start = time.process_time()
+            timer.start()
+            ret, frame = source.read()
+            if not ret:
+                break
+            timer.mark("read")
+
+            frame = cv2.flip(frame, 1)
+            timer.mark("flip")
+            h, w = frame.shape[:2]
+            # cvtColor + hands.process, on the tracked crop in ROI mode
+            inferred = cadence is None or cadence.should_infer()
+            timings = {}
+            if inferred:
+                results = detector.detect(frame, timings)
+                hands = results.multi_hand_landmarks or []
+            timer.split(DETECT_PARTS, timings, rest="detect_other")
+
+            for hand_landmarks in hands:
+                detector.draw(frame, hand_landmarks)
+            timer.mark("draw_landmarks")
+            angles = None
+            pose_match = False
+            for hand_landmarks in hands:
+                angles = hand_angles(hand_landmarks, w, h, poses.uses_joints)
+                margins = poses.margins(angles)
+                pose_match = poses.matches(margins, args.pose)
+                draw_match(frame, pose_match, poses.closest(margins))
+                detected += 1
+                matched += pose_match
+            if cadence is not None:
+                wrist = hands[0].landmark[0] if hands else None
+                cadence.observe(inferred, angles, (wrist.x, wrist.y) if wrist else None, pose_match)
+            timer.mark("classify")
+
+            if args.legacy_preview:
+                pil_img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                timer.mark("display_convert")
+                pil_img = crop_and_resize(pil_img, args.width, args.height)
+                timer.mark("crop_resize")
+            else:
+                timings = {}
+                pil_img = preview.render(frame, timings)
+                timer.split(PREVIEW_PARTS, timings)
+            if handoff is not None:
+                handoff.show(pil_img)
+                timer.mark("imagetk")
+            frames += 1
+    finally:
+        detector.close()
+        source.release()
+
+    measured = max(0, frames - args.warmup)
+    if measured == 0 or wall_start is None:
+        return {"clip": path, "frames": frames, "error": "not enough frames after warm-up"}
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    totals = np.sum([timer.samples[name] for name in STAGES if timer.samples[name]], axis=0)
+    return {
+        "clip": path,
+        "frames": measured,
+        "warmup_frames": args.warmup,
+        "wall_s": wall,
+        "fps": measured / wall if wall > 0 else None,
+        "cpu_ms_per_frame": cpu * 1000.0 / measured,
+        "hands_detected": detected,
+        "pose_matched": matched,
+        "roi": tracker.stats() if tracker is not None else None,
+        "cadence": cadence.stats() if cadence is not None else None,
+        "stages": {name: summarize(timer.samples[name]) for name in STAGES},
+        "frame_total": summarize(totals.tolist()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hand detection pipeline on recorded clips")
+    parser.add_argument("clips", nargs="+", help="video files or directories of frames")
+    parser.add_argument("--output", "-o", help="write JSON here instead of stdout")
+    parser.add_argument("--warmup", type=int, default=5, help="frames excluded from the statistics")
+    parser.add_argument("--max-frames", type=int, default=0, help="measured frames per clip, 0 = whole clip")
+    parser.add_argument("--pose", type=int, default=1, help="pose to match against")
+    parser.add_argument("--poses", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "poses.json"),
+                        help="pose definitions file")
+    parser.add_argument("--fps", type=float, default=30.0, help="nominal fps for frame directories")
+    parser.add_argument("--width", type=int, default=400, help="preview width (1920x1080 layout)")
+    parser.add_argument("--height", type=int, default=570, help="preview height (1920x1080 layout)")
+    parser.add_argument("--roi", action="store_true", help="run inference on the tracked hand region")
+    parser.add_argument("--roi-padding", type=float, default=0.35, help="ROI padding per side")
+    parser.add_argument("--worker", action="store_true", help="run inference in a separate process")
+    parser.add_argument("--adaptive", action="store_true", help="lower the inference rate on stable poses")
+    parser.add_argument("--stable-interval", type=int, default=4, help="infer one frame in N while stable")
+    parser.add_argument("--legacy-preview", action="store_true",
+                        help="PIL LANCZOS preview and a new PhotoImage per frame, for comparison")
+    parser.add_argument("--no-tk", action="store_true", help="skip the ImageTk handoff stage")
+    args = parser.parse_args(argv)
+
+    handoff = None
+    if not args.no_tk:
+        try:
+            handoff = TkHandoff(legacy=args.legacy_preview)
+        except Exception as e:
+            print(f"[benchmark] ImageTk stage skipped: {e}", file=sys.stderr)
+
+    try:
+        poses = PoseClassifier.from_file(args.poses)
+        clips = [run_clip(path, args, handoff, poses) for path in args.clips]
+    finally:
+        if handoff is not None:
+            handoff.close()
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "mediapipe": getattr(mp, "__version__", None),
+        },
+        "stages": STAGES,
+        "clips": clips,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    main()
@@ -0,0 +1,82 @@
+class InferenceCadence:
+    """Lowers the inference rate while a matched pose is held still.
+
+    Every captured frame is still displayed; on skipped frames the caller reuses
+    the landmarks of the last inference. Any motion, lost hand or pose mismatch
+    returns to inference on every frame.
+    """
+
+    def __init__(self, stable_interval=4, stable_after=5, angle_tolerance=8.0, move_tolerance=0.03):
+        # Run inference on one frame in stable_interval while stable
+        self.stable_interval = max(1, stable_interval)
+        # Consecutive still, matched inferences needed before slowing down
+        self.stable_after = stable_after
+        # Largest per-finger angle change (degrees) still counted as still
+        self.angle_tolerance = angle_tolerance
+        # Largest wrist movement (fraction of the frame) still counted as still
+        self.move_tolerance = move_tolerance
+
+        self.stable = False
+        self._still_count = 0
+        self._since_inference = 0
+        self._last_angles = None
+        self._last_wrist = None
+
+        self.inferred = 0
+        self.reused = 0
+        self.slowdowns = 0
+        self.speedups = 0
+
+    def should_infer(self):
+        if not self.stable or self._since_inference + 1 >= self.stable_interval:
+            self._since_inference = 0
+            self.inferred += 1
+            return True
+        self._since_inference += 1
+        self.reused += 1
+        return False
+
+    def observe(self, inferred, angles, wrist, pose_match):
+        """Feed back the frame's outcome; angles and wrist are None when no hand was found"""
+        if angles is None or not pose_match:
+            self._reset()
+            return
+        if not inferred:
+            return
+
+        still = False
+        if self._last_angles is not None:
+            d_angle = max(abs(a - b) for a, b in zip(angles, self._last_angles))
+            d_move = max(abs(wrist[0] - self._last_wrist[0]), abs(wrist[1] - self._last_wrist[1]))
+            still = d_angle <= self.angle_tolerance and d_move <= self.move_tolerance
+        self._last_angles = angles
+        self._last_wrist = wrist
+
+        if not still:
+            self._still_count = 0
+            if self.stable:
+                self.stable = False
+                self.speedups += 1
+            return
+        self._still_count += 1
+        if not self.stable and self._still_count >= self.stable_after:
+            self.stable = True
+            self.slowdowns += 1
+
+    def _reset(self):
+        if self.stable:
+            self.speedups += 1
+        self.stable = False
+        self._still_count = 0
+        self._since_inference = 0
+        self._last_angles = None
+        self._last_wrist = None
+
+    def stats(self):
+        return {
+            "stable": self.stable,
+            "inferred": self.inferred,
+            "reused": self.reused,
+            "slowdowns": self.slowdowns,
+            "speedups": self.speedups,
+        }
@@ -0,0 +1,99 @@
+import threading
+import time
+from collections import deque
+
+
+class FrameBuffer:
+    """Drop-oldest buffer holding the most recent captured frames.
+
+    Each entry is (seq, timestamp, frame). seq increases by one per captured
+    frame, so a consumer can tell how many frames it skipped. Frames are shared
+    between consumers and must be treated as read-only.
+    """
+
+    def __init__(self, maxlen=2):
+        self._frames = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        self.seq = 0
+        # Frames pushed out before any consumer was handed them
+        self.dropped = 0
+        self._read_seq = 0
+        self.closed = False
+
+    def publish(self, frame, timestamp):
+        with self._cond:
+            if len(self._frames) == self._frames.maxlen and self._frames[0][0] > self._read_seq:
+                self.dropped += 1
+            self.seq += 1
+            self._frames.append((self.seq, timestamp, frame))
+            self._cond.notify_all()
+            return self.seq
+
+    def latest(self):
+        """Newest entry or None. Never blocks, safe to call from the Tk thread."""
+        with self._cond:
+            return self._take()
+
+    def wait_newer(self, seq, timeout=None):
+        """Block until an entry newer than seq exists and return the newest one.
+
+        Returns None on timeout or once the buffer is closed with nothing new.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.closed or self.seq > seq, timeout)
+            if self.seq <= seq or not self._frames:
+                return None
+            return self._take()
+
+    def _take(self):
+        # Caller holds the lock
+        if not self._frames:
+            return None
+        entry = self._frames[-1]
+        self._read_seq = max(self._read_seq, entry[0])
+        return entry
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class CaptureThread(threading.Thread):
+    """Sole owner of the frame source: reads every frame once and publishes it."""
+
+    def __init__(self, source, buffer=None):
+        super().__init__(daemon=True)
+        self.source = source
+        self.buffer = buffer if buffer is not None else FrameBuffer()
+        self.running = True
+        self.frames_captured = 0
+        self.read_failures = 0
+        # Back off on repeated read failures instead of polling every 10 ms
+        self.retry_delay = 0.01
+        self.max_retry_delay = 0.5
+
+    def run(self):
+        delay = self.retry_delay
+        try:
+            while self.running:
+                ret, frame = self.source.read()
+                if not ret:
+                    if getattr(self.source, "exhausted", False):
+                        break
+                    self.read_failures += 1
+                    time.sleep(delay)
+                    delay = min(delay * 2, self.max_retry_delay)
+                    continue
+                delay = self.retry_delay
+                self.frames_captured += 1
+                self.buffer.publish(frame, time.perf_counter())
+        except Exception as e:
+            print(f"[Capture] {e}")
+        finally:
+            self.buffer.close()
+
+    def stop(self, timeout=1.0):
+        self.running = False
+        if self.is_alive():
+            self.join(timeout=timeout)
@@ -0,0 +1,127 @@
+"""Time the history chart on a long synthetic history: per-day artists versus the batched ProgressPlot.
+
+    python chart_benchmark.py --years 1 3 5 --output chart_bench.json
+"""
+import argparse
+import json
+import platform
+import time
+from datetime import datetime, timedelta
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from progress_chart import ProgressPlot, candle_colors
+
+
+def synthetic_history(days, seed=0):
+    rng = np.random.default_rng(seed)
+    poses = rng.integers(0, 200, size=days)
+    start = datetime(2020, 1, 1)
+    history = []
+    for i, n in enumerate(poses):
+        reps = int(n) // 5
+        history.append({
+            "date": start + timedelta(days=i),
+            "poses": int(n),
+            "reps": reps,
+            "sets_done": reps // 10,
+            "progress": min(reps / 30.0 * 100.0, 100.0),
+        })
+    return history
+
+
+def legacy_open(history):
+    """One history-page open as draw_progress_chart did it: a new pyplot figure, artists per day."""
+    fig, ax = plt.subplots(figsize=(10, 4), dpi=80)
+    dates = [h["date"] for h in history]
+    progresses = [h["progress"] for h in history]
+    colors = candle_colors(progresses)
+    prev = progresses[0]
+    for i, p in enumerate(progresses):
+        low, high = min(prev, p), max(prev, p)
+        ax.vlines(dates[i], low, high, color=colors[i], linewidth=2)
+        ax.vlines(dates[i], prev, p, color=colors[i], linewidth=8)
+        if i > 0 and p != progresses[i - 1]:
+            ax.annotate("↑" if p > progresses[i - 1] else "↓", xy=(dates[i], p + 3), ha="center")
+        ax.plot(dates[i], p, "o", color="black", markersize=8)
+        prev = p
+    ax.set_ylim(0, 110)
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.canvas.draw()
+    # The old code never closed its figures
+    return fig
+
+
+class BatchedChart:
+    def __init__(self):
+        self.fig = Figure(figsize=(10, 4), dpi=80)
+        self.canvas = FigureCanvasAgg(self.fig)
+        self.plot = ProgressPlot(self.fig.add_subplot())
+        self.first = True
+
+    def open(self, history):
+        self.plot.set_history(history)
+        if self.first:
+            self.fig.autofmt_xdate()
+            self.fig.tight_layout()
+            self.first = False
+        self.canvas.draw()
+
+
+def time_opens(fn, opens):
+    times = []
+    for _ in range(opens):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"first_ms": times[0] * 1000, "median_ms": float(np.median(times)) * 1000}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark history chart rendering")
+    parser.add_argument("--years", type=float, nargs="+", default=[1, 3, 5], help="history lengths to test")
+    parser.add_argument("--opens", type=int, default=5, help="history page opens per length")
+    parser.add_argument("--output", "-o", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = []
+    for years in args.years:
+        history = synthetic_history(int(years * 365))
+        figures_before = len(plt.get_fignums())
+        legacy = time_opens(lambda: legacy_open(history), args.opens)
+        leaked = len(plt.get_fignums()) - figures_before
+        plt.close("all")
+
+        chart = BatchedChart()
+        batched = time_opens(lambda: chart.open(history), args.opens)
+        results.append({
+            "days": len(history),
+            "legacy": dict(legacy, figures_left_open=leaked),
+            "batched": dict(batched, artists=len(chart.plot.ax.get_children())),
+            "speedup_median": legacy["median_ms"] / batched["median_ms"] if batched["median_ms"] else None,
+        })
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "matplotlib": matplotlib.__version__,
+            "numpy": np.__version__,
+        },
+        "opens": args.opens,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
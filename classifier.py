@@ -0,0 +1,92 @@
+"""Pose definitions loaded from poses.json (or a .toml file) and matched with NumPy.
+
+Each pose gives an allowed [min, max] angle per finger, and optionally per joint
+("index_pip", ...; see geometry.FEATURE_NAMES). All poses are compiled into
+(P, F) lower/upper bound arrays, so a single comparison scores every pose for a
+frame (or a stack of frames) at once. F is 5, or 20 once any pose constrains a
+joint; the caller asks hand_angles() for joint angles when uses_joints is set.
+"""
+import json
+import os
+import numpy as np
+from geometry import FEATURE_NAMES, FINGER_NAMES
+
+
+class PoseClassifier:
+    def __init__(self, poses):
+        if not poses:
+            raise ValueError("no poses defined")
+        ids = [int(p["id"]) for p in poses]
+        if ids != list(range(1, len(poses) + 1)):
+            raise ValueError(f"pose ids must be 1..{len(poses)} in exercise order, got {ids}")
+        for pose in poses:
+            self._validate_ranges(pose)
+        self.poses = poses
+        self.names = [p["name"] for p in poses]
+        self.images = [p.get("image") for p in poses]
+        self.sounds = [p.get("sound") for p in poses]
+
+        self.uses_joints = any(key not in FINGER_NAMES for pose in poses for key in pose["ranges"])
+        self.features = FEATURE_NAMES if self.uses_joints else FINGER_NAMES
+        lower = np.full((len(poses), len(self.features)), -np.inf)
+        upper = np.full((len(poses), len(self.features)), np.inf)
+        for i, pose in enumerate(poses):
+            for j, feature in enumerate(self.features):
+                # A finger or joint left out of the definition is unconstrained
+                if feature in pose["ranges"]:
+                    lower[i, j], upper[i, j] = pose["ranges"][feature]
+        self.lower = lower
+        self.upper = upper
+
+    @staticmethod
+    def _validate_ranges(pose):
+        # A misspelt key would otherwise leave that finger unconstrained without a word
+        for key, bounds in pose["ranges"].items():
+            if key not in FEATURE_NAMES:
+                raise ValueError(f"pose {pose['id']}: unknown range {key!r}, expected one of {FEATURE_NAMES}")
+            if len(bounds) != 2:
+                raise ValueError(f"pose {pose['id']}: range {key!r} must be [min, max], got {bounds}")
+            low, high = bounds
+            if low > high:
+                raise ValueError(f"pose {pose['id']}: range {key!r} has min {low} > max {high}")
+
+    @classmethod
+    def from_file(cls, path):
+        if os.path.splitext(path)[1].lower() == ".toml":
+            import tomllib
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        # The finger order the ranges were written for must be the one geometry computes
+        fingers = data.get("fingers", FINGER_NAMES)
+        if list(fingers) != FINGER_NAMES:
+            raise ValueError(f"{path}: fingers must be {FINGER_NAMES}, got {fingers}")
+        return cls(data["poses"])
+
+    def __len__(self):
+        return len(self.poses)
+
+    def margins(self, angles):
+        """Per-feature distance inside each pose's range, shape (..., P, F).
+
+        Positive means inside the range, negative is how far outside. angles is (F,)
+        for one frame or (N, F) for a stack of frames.
+        """
+        a = np.asarray(angles, dtype=np.float64)[..., None, :]
+        return np.minimum(a - self.lower, self.upper - a)
+
+    def matches(self, margins, pose_id, tolerance=0.0):
+        """True if every finger is inside the range of pose_id, widened by tolerance degrees.
+
+        Returns an array for stacked frames.
+        """
+        index = pose_id - 1 if 1 <= pose_id <= len(self.poses) else 0
+        ok = margins[..., index, :].min(axis=-1) >= -tolerance
+        return bool(ok) if ok.ndim == 0 else ok
+
+    def closest(self, margins):
+        """Id of the pose whose worst finger is furthest inside (or least outside) its range"""
+        best = np.argmax(margins.min(axis=-1), axis=-1) + 1
+        return int(best) if best.ndim == 0 else best
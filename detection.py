@@ -0,0 +1,91 @@
+import time
+import cv2
+import mediapipe as mp
+from geometry import landmarks_to_array, hand_features
+
+LANDMARK_SPEC = mp.solutions.drawing_utils.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=4)
+CONNECTION_SPEC = mp.solutions.drawing_utils.DrawingSpec(color=(255, 0, 0), thickness=2, circle_radius=2)
+
+
+def draw_hand(frame, hand_landmarks):
+    mp.solutions.drawing_utils.draw_landmarks(
+        frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS,
+        LANDMARK_SPEC, CONNECTION_SPEC
+    )
+
+
+class HandDetector:
+    """MediaPipe Hands running in this process, with optional hand-ROI tracking."""
+
+    def __init__(self, max_num_hands=1, min_detection_confidence=0.5, min_tracking_confidence=0.5, tracker=None):
+        self.tracker = tracker
+        self.hands = mp.solutions.hands.Hands(
+            static_image_mode=False, max_num_hands=max_num_hands,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    def process(self, rgb):
+        return self.hands.process(rgb)
+
+    def _infer(self, bgr, timings):
+        if timings is None:
+            return self.hands.process(cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB))
+        t0 = time.perf_counter()
+        rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+        t1 = time.perf_counter()
+        results = self.hands.process(rgb)
+        t2 = time.perf_counter()
+        timings["cvt_color"] = timings.get("cvt_color", 0.0) + (t1 - t0) * 1000.0
+        timings["hands_process"] = timings.get("hands_process", 0.0) + (t2 - t1) * 1000.0
+        return results
+
+    def detect(self, frame, timings=None):
+        """Run inference on a BGR frame, on the tracked hand region when there is one.
+
+        Landmarks are always returned normalised to the full frame. When timings is
+        a dict, milliseconds spent in cvt_color and hands_process are added to it.
+        """
+        h, w = frame.shape[:2]
+        roi = self.tracker.region() if self.tracker is not None else None
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            results = self._infer(frame[y0:y1, x0:x1], timings)
+            if results.multi_hand_landmarks:
+                for hand_landmarks in results.multi_hand_landmarks:
+                    self.tracker.to_frame(hand_landmarks, roi, w, h)
+            else:
+                # Tracking lost, fall back to a full-frame search on the same frame
+                self.tracker.lost()
+                roi = None
+        if roi is None:
+            results = self._infer(frame, timings)
+        if self.tracker is not None:
+            if results.multi_hand_landmarks:
+                self.tracker.update(results.multi_hand_landmarks[0], w, h)
+            else:
+                self.tracker.lost()
+        return results
+
+    def draw(self, frame, hand_landmarks):
+        draw_hand(frame, hand_landmarks)
+
+    def close(self):
+        self.hands.close()
+
+
+def hand_angles(hand_landmarks, w, h, joints=False):
+    """(thumb, index, middle, ring, pinky) angles for one detected hand, then the 3D joint angles with joints"""
+    pts = landmarks_to_array(hand_landmarks.landmark, w, h)
+    return tuple(hand_features(pts, joints).tolist())
+
+
+def draw_match(frame, pose_match, closest=None):
+    text = f"Match:{'YES' if pose_match else 'NO'}"
+    if not pose_match and closest is not None:
+        text += f" Closest:{closest}"
+    try:
+        cv2.putText(frame, text, (10, 180),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 200, 0) if pose_match else (0, 0, 200), 2)
+    except Exception:
+        pass
@@ -0,0 +1,66 @@
+import time
+import cv2
+from PIL import Image
+
+
+def crop_and_resize(img, target_w, target_h):
+    """Centre-crop a PIL image to the target aspect ratio, then LANCZOS resize it.
+
+    This is the original preview path, kept so benchmark.py can compare against it.
+    """
+    box = crop_box(img.size[0], img.size[1], target_w, target_h)
+    return img.crop(box).resize((target_w, target_h), Image.LANCZOS)
+
+
+def crop_box(src_w, src_h, target_w, target_h):
+    """Centred (x0, y0, x1, y1) crop of a src_w x src_h frame with the target aspect ratio"""
+    target_ratio = target_w / target_h
+    if src_w / src_h > target_ratio:
+        new_w = int(src_h * target_ratio)
+        left = (src_w - new_w) // 2
+        return left, 0, left + new_w, src_h
+    new_h = int(src_w / target_ratio)
+    top = (src_h - new_h) // 2
+    return 0, top, src_w, top + new_h
+
+
+class PreviewRenderer:
+    """Turns a BGR camera frame into the RGB PIL image shown in the camera label.
+
+    The crop rectangle is computed once per source resolution. The crop is a NumPy
+    view, resized in OpenCV, and only the small result is converted to RGB.
+    """
+
+    def __init__(self, target_w, target_h):
+        self.target_w = target_w
+        self.target_h = target_h
+        self._src_size = None
+        self._box = None
+        self._interpolation = cv2.INTER_AREA
+
+    def _update_geometry(self, src_w, src_h):
+        self._src_size = (src_w, src_h)
+        self._box = crop_box(src_w, src_h, self.target_w, self.target_h)
+        x0, y0, x1, y1 = self._box
+        # Bilinear is several times cheaper than INTER_AREA and alias-free down to 2:1;
+        # only larger reductions need INTER_AREA
+        if x1 - x0 >= 2 * self.target_w:
+            self._interpolation = cv2.INTER_AREA
+        else:
+            self._interpolation = cv2.INTER_LINEAR
+
+    def render(self, frame, timings=None):
+        """Preview image for frame; timings, when a dict, gets crop_resize and display_convert ms."""
+        h, w = frame.shape[:2]
+        if self._src_size != (w, h):
+            self._update_geometry(w, h)
+        x0, y0, x1, y1 = self._box
+        t0 = time.perf_counter()
+        small = cv2.resize(frame[y0:y1, x0:x1], (self.target_w, self.target_h), interpolation=self._interpolation)
+        t1 = time.perf_counter()
+        cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=small)
+        img = Image.fromarray(small)
+        if timings is not None:
+            timings["crop_resize"] = (t1 - t0) * 1000.0
+            timings["display_convert"] = (time.perf_counter() - t1) * 1000.0
+        return img
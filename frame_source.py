@@ -0,0 +1,142 @@
+import os
+import time
+import cv2
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource:
+    """Base frame source with the same read()/isOpened()/release() surface as cv2.VideoCapture.
+
+    Recorded sources (video file, image directory) are replayed either at their
+    recorded fps (realtime=True) or as fast as they can be decoded (realtime=False).
+    """
+
+    def __init__(self, fps=30.0, realtime=True, loop=False):
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.realtime = realtime
+        self.loop = loop
+        self.exhausted = False
+        self.frames_read = 0
+        self._replay_start = None
+
+    def read(self):
+        return False, None
+
+    def isOpened(self):
+        return False
+
+    def release(self):
+        pass
+
+    def _pace(self):
+        # Hold the replay clock to the recorded frame rate
+        if not self.realtime:
+            return
+        now = time.perf_counter()
+        if self._replay_start is None:
+            self._replay_start = now
+        due = self._replay_start + self.frames_read / self.fps
+        if due > now:
+            time.sleep(due - now)
+
+    def _rewind(self):
+        self.frames_read = 0
+        self._replay_start = None
+
+
+class CameraSource(FrameSource):
+    def __init__(self, index=0, width=1280, height=720):
+        self.cap = cv2.VideoCapture(index)
+        fps = 30.0
+        if self.cap.isOpened():
+            # Try to set camera to a decent resolution, will be resized later
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            fps = self.cap.get(cv2.CAP_PROP_FPS) or fps
+        # A live camera is paced by the device itself
+        super().__init__(fps=fps, realtime=False)
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if ret:
+            self.frames_read += 1
+        return ret, frame
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, realtime=True, loop=False):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS) if self.cap.isOpened() else 0.0
+        super().__init__(fps=fps, realtime=realtime, loop=loop)
+
+    def read(self):
+        if self.exhausted:
+            return False, None
+        ret, frame = self.cap.read()
+        if not ret and self.loop and self.frames_read > 0:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self._rewind()
+            ret, frame = self.cap.read()
+        if not ret:
+            self.exhausted = True
+            return False, None
+        self._pace()
+        self.frames_read += 1
+        return True, frame
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageSequenceSource(FrameSource):
+    def __init__(self, directory, fps=30.0, realtime=True, loop=False):
+        self.directory = directory
+        self.files = sorted(
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self._index = 0
+        super().__init__(fps=fps, realtime=realtime, loop=loop)
+
+    def read(self):
+        if self.exhausted:
+            return False, None
+        if self._index >= len(self.files):
+            if not (self.loop and self.files):
+                self.exhausted = True
+                return False, None
+            self._index = 0
+            self._rewind()
+        frame = cv2.imread(self.files[self._index])
+        self._index += 1
+        if frame is None:
+            return False, None
+        self._pace()
+        self.frames_read += 1
+        return True, frame
+
+    def isOpened(self):
+        return bool(self.files)
+
+
+def open_frame_source(spec=0, realtime=True, loop=False, fps=30.0):
+    """Open a frame source from a camera index, a video file path or a directory of frames."""
+    if spec is None or spec == "":
+        spec = 0
+    if isinstance(spec, int) or str(spec).isdigit():
+        return CameraSource(int(spec))
+    if os.path.isdir(spec):
+        return ImageSequenceSource(spec, fps=fps, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
@@ -0,0 +1,88 @@
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST = 0
+
+# MediaPipe hand landmark chains, wrist -> tip, for thumb, index, middle, ring, pinky
+FINGER_CHAINS = np.array([
+    [0, 1, 2, 3, 4],
+    [0, 5, 6, 7, 8],
+    [0, 9, 10, 11, 12],
+    [0, 13, 14, 15, 16],
+    [0, 17, 18, 19, 20],
+])
+FINGER_NAMES = ["thumb", "index", "middle", "ring", "pinky"]
+# Joint names per finger; for the thumb these are CMC, MCP and IP
+JOINT_NAMES = ["mcp", "pip", "dip"]
+# Per-joint feature names ("index_pip", ...) in joint_angles() order, flattened
+JOINT_FEATURES = [f"{finger}_{joint}" for finger in FINGER_NAMES for joint in JOINT_NAMES]
+# Everything a pose may constrain: the five pose angles, then the 15 joint angles
+FEATURE_NAMES = FINGER_NAMES + JOINT_FEATURES
+
+# (prev, joint, next) landmark triplets for every MCP/PIP/DIP joint, shape (5, 3, 3)
+JOINT_TRIPLETS = np.stack([FINGER_CHAINS[:, 0:3], FINGER_CHAINS[:, 1:4], FINGER_CHAINS[:, 2:5]], axis=1)
+
+# (tip, mcp, wrist) triplets used for pose matching, shape (5, 3)
+POSE_TRIPLETS = np.array([
+    [4, 2, WRIST],
+    [8, 5, WRIST],
+    [12, 9, WRIST],
+    [16, 13, WRIST],
+    [20, 17, WRIST],
+])
+
+
+def landmarks_to_array(landmarks, width, height):
+    """Convert 21 MediaPipe landmarks to a (21, 3) pixel-space array.
+
+    z is scaled by the image width, which is how MediaPipe normalises depth.
+    """
+    pts = np.array([(p.x, p.y, p.z) for p in landmarks], dtype=np.float64)
+    pts *= (width, height, width)
+    return pts
+
+
+def angles_at(points, triplets):
+    """Angle in degrees at triplets[..., 1] between the rays to triplets[..., 0] and triplets[..., 2].
+
+    points is (..., 21, D) so a single frame (21, D) or a stack of N frames (N, 21, D)
+    works the same. The result has shape points.shape[:-2] + triplets.shape[:-1].
+    Degenerate (zero-length) rays give 0.0.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    a = points[..., triplets[..., 0], :]
+    b = points[..., triplets[..., 1], :]
+    c = points[..., triplets[..., 2], :]
+    v1 = a - b
+    v2 = c - b
+    dot = np.sum(v1 * v2, axis=-1)
+    if points.shape[-1] == 2:
+        cross = np.abs(v1[..., 0] * v2[..., 1] - v1[..., 1] * v2[..., 0])
+    else:
+        cross = np.linalg.norm(np.cross(v1, v2), axis=-1)
+    return np.degrees(np.arctan2(cross, dot))
+
+
+def joint_angles(points):
+    """3D MCP/PIP/DIP angles for every finger, shape (..., 5, 3). 180 means a straight joint."""
+    return angles_at(points, JOINT_TRIPLETS)
+
+
+def pose_angles(points):
+    """Per-finger tip-MCP-wrist angles in the image plane, shape (..., 5).
+
+    These are the angles the pose ranges were tuned against, so only x and y are used.
+    """
+    return angles_at(np.asarray(points)[..., :2], POSE_TRIPLETS)
+
+
+def hand_features(points, joints=False):
+    """Classifier features in FEATURE_NAMES order, shape (..., 5) or (..., 20) with joints.
+
+    The five pose angles always come first; joints=True appends the 3D joint angles.
+    """
+    pose = pose_angles(points)
+    if not joints:
+        return pose
+    per_joint = joint_angles(points)
+    return np.concatenate([pose, per_joint.reshape(per_joint.shape[:-2] + (len(JOINT_FEATURES),))], axis=-1)
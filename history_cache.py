@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+from datetime import date
+from log_parser import parse_buffer
+
+# Bytes just before the parsed offset that must still match for an incremental parse
+FINGERPRINT_BYTES = 256
+
+
+class DailyCountCache:
+    """Per-day pose counts of a text log, parsed incrementally.
+
+    A JSON sidecar stores the byte offset parsed so far, the counts up to it and
+    the log's size, mtime and inode. An unchanged log is answered from the
+    sidecar; a grown log is parsed from the offset only. A log that was replaced,
+    shrank, changed without growing or whose bytes before the offset changed is
+    parsed again from the start.
+    """
+
+    def __init__(self, log_path, cache_path=None):
+        self.log_path = log_path
+        self.cache_path = cache_path or f"{log_path}.cache.json"
+        self.offset = 0
+        self.size = -1
+        self.mtime_ns = -1
+        self.ino = -1
+        self.fingerprint = ""
+        self.daily = {}
+        self.bytes_parsed = 0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.offset = int(data["offset"])
+            self.size = int(data["size"])
+            self.mtime_ns = int(data["mtime_ns"])
+            self.ino = int(data["ino"])
+            self.fingerprint = data["fingerprint"]
+            self.daily = {date.fromisoformat(k): int(v) for k, v in data["daily"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self.size = -1
+        self.mtime_ns = -1
+        self.ino = -1
+        self.fingerprint = ""
+        self.daily = {}
+
+    def _save(self):
+        data = {
+            "offset": self.offset,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "ino": self.ino,
+            "fingerprint": self.fingerprint,
+            "daily": {d.isoformat(): n for d, n in sorted(self.daily.items())},
+        }
+        tmp = self.cache_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cache_path)
+        except OSError as e:
+            print(f"[History] cache write error: {e}")
+
+    @staticmethod
+    def _fingerprint(f, offset):
+        start = max(0, offset - FINGERPRINT_BYTES)
+        f.seek(start)
+        return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+    @staticmethod
+    def _count(chunk, daily):
+        for day, n in parse_buffer(chunk, fields=False).daily_counts().items():
+            daily[day] = daily.get(day, 0) + n
+
+    def counts(self):
+        """{date: poses} for the whole log, reading only bytes not parsed before."""
+        self.bytes_parsed = 0
+        try:
+            st = os.stat(self.log_path)
+        except OSError:
+            self._reset()
+            return {}
+        if st.st_size == self.size and st.st_mtime_ns == self.mtime_ns and st.st_ino == self.ino:
+            return dict(self.daily)
+
+        with open(self.log_path, "rb") as f:
+            # Appending always grows the file, so any other change means a rewrite
+            if (st.st_ino != self.ino or st.st_size <= self.size or st.st_size < self.offset
+                    or self._fingerprint(f, self.offset) != self.fingerprint):
+                self._reset()
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+            # A line still being written is left for the next call
+            end = data.rfind(b"\n") + 1
+            self._count(data[:end], self.daily)
+            self.offset += end
+            self.bytes_parsed = end
+            self.fingerprint = self._fingerprint(f, self.offset)
+        self.size = st.st_size
+        self.mtime_ns = st.st_mtime_ns
+        self.ino = st.st_ino
+        self._save()
+        return dict(self.daily)
@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+LEVELS = ("day", "week", "month")
+# Most buckets drawn at once; a wider visible range moves up a level
+MAX_POINTS = 120
+
+
+def bucket_start(d, level):
+    """First day of the day/week (Monday)/month bucket holding date d."""
+    if level == "week":
+        return d - timedelta(days=d.weekday())
+    if level == "month":
+        return d.replace(day=1)
+    return d
+
+
+def next_bucket(d, level):
+    if level == "week":
+        return d + timedelta(days=7)
+    if level == "month":
+        return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return d + timedelta(days=1)
+
+
+def bucket_days(level):
+    """Nominal bucket length in days, for hit-testing and bar spacing."""
+    return {"day": 1, "week": 7, "month": 30}[level]
+
+
+def choose_level(start, end, max_points=MAX_POINTS):
+    """Finest level that shows [start, end] in at most max_points buckets."""
+    span = (end - start).days + 1
+    if span <= max_points:
+        return "day"
+    if span <= max_points * 7:
+        return "week"
+    return "month"
+
+
+def rollup(daily, level):
+    """{bucket start: (poses, active days)} from {date: poses}."""
+    buckets = {}
+    for day, poses in daily.items():
+        key = bucket_start(day, level)
+        total, active = buckets.get(key, (0, 0))
+        buckets[key] = (total + poses, active + (1 if poses else 0))
+    return buckets
+
+
+def build_series(buckets, start, end, level, last_day=None, daily_target_reps=30, poses_per_rep=5, reps_per_set=10):
+    """Progress entries for every bucket overlapping [start, end], gaps included.
+
+    buckets maps bucket start to (poses, active days). Day progress is the day's
+    reps against the daily target; week and month progress compares the bucket's
+    reps with the target over its days, counted only up to last_day for the
+    bucket still in progress.
+    """
+    series = []
+    key = bucket_start(start, level)
+    while key <= end:
+        following = next_bucket(key, level)
+        poses, active = buckets.get(key, (0, 0))
+        reps = poses // poses_per_rep
+        days = (min(following, last_day + timedelta(days=1)) - key).days if last_day else (following - key).days
+        days = max(days, 1)
+        if daily_target_reps > 0:
+            progress = min((reps / float(daily_target_reps * days)) * 100.0, 100.0)
+        else:
+            progress = 0.0
+        series.append({
+            'date': datetime.combine(key, datetime.min.time()),
+            'poses': poses,
+            'reps': reps,
+            'sets_done': reps // reps_per_set,
+            'progress': progress,
+            'active_days': active,
+            'level': level,
+        })
+        key = following
+    return series
@@ -0,0 +1,325 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from datetime import date, datetime, timedelta
+from history_series import bucket_start
+
+# Rollup table and key column per level; day buckets come from the daily table
+ROLLUPS = {"day": ("daily", "day"), "week": ("weekly", "week"), "month": ("monthly", "month")}
+
+# [YYYY-MM-DD HH:MM:SS] เซ็ตที่ <set> ครั้งที่ <round> : <message>
+LOG_LINE = re.compile(r"^\[(\d{4}-\d{2}-\d{2}) (\d{2}:\d{2}:\d{2})\]\s*เซ็ตที่\s*(\d+)\s*ครั้งที่\s*(\d+)\s*:\s*(.*)$")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+IMPORT_PREFIX = "imported:"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    day TEXT NOT NULL,
+    set_no INTEGER,
+    round_no INTEGER,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events(ts);
+CREATE TABLE IF NOT EXISTS daily (
+    day TEXT PRIMARY KEY,
+    poses INTEGER NOT NULL,
+    first_ts TEXT,
+    last_ts TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS weekly (
+    week TEXT PRIMARY KEY,
+    poses INTEGER NOT NULL,
+    active_days INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS monthly (
+    month TEXT PRIMARY KEY,
+    poses INTEGER NOT NULL,
+    active_days INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+
+def parse_log_line(line):
+    """(ts, day, set, round, message) for one log line, or None if it is not an event line."""
+    m = LOG_LINE.match(line.strip())
+    if m is None:
+        return None
+    day, clock, set_no, round_no, message = m.groups()
+    return f"{day} {clock}", day, int(set_no), int(round_no), message
+
+
+def prefix_crc(f, offset, chunk_size=1 << 20):
+    """CRC-32 of the first offset bytes of binary file f."""
+    f.seek(0)
+    crc = 0
+    remaining = offset
+    while remaining > 0:
+        chunk = f.read(min(chunk_size, remaining))
+        if not chunk:
+            break
+        crc = zlib.crc32(chunk, crc)
+        remaining -= len(chunk)
+    return crc
+
+
+class HistoryStore:
+    """SQLite store of pose events plus day, week and month aggregates maintained on insert.
+
+    Events are written from the log writer thread and read from the Tk thread,
+    so one connection is shared behind a lock.
+    """
+
+    def __init__(self, path="history.db"):
+        self.path = path
+        # Text log kept in step by add_lines(), set by import_text_log()
+        self.follow_path = None
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+            self._backfill_rollups()
+            self.conn.commit()
+
+    def _backfill_rollups(self):
+        # Databases created before the week/month tables existed
+        if self.conn.execute("SELECT 1 FROM weekly LIMIT 1").fetchone() or \
+                not self.conn.execute("SELECT 1 FROM daily LIMIT 1").fetchone():
+            return
+        self.conn.execute(
+            "INSERT INTO weekly(week, poses, active_days) "
+            "SELECT date(day, 'weekday 0', '-6 days'), sum(poses), count(*) FROM daily GROUP BY 1"
+        )
+        self.conn.execute(
+            "INSERT INTO monthly(month, poses, active_days) "
+            "SELECT strftime('%Y-%m-01', day), sum(poses), count(*) FROM daily GROUP BY 1"
+        )
+
+    def _insert(self, rows):
+        self.conn.executemany(
+            "INSERT INTO events(ts, day, set_no, round_no, message) VALUES (?, ?, ?, ?, ?)", rows
+        )
+        per_day = {}
+        for ts, day, *_ in rows:
+            count, first, last = per_day.get(day, (0, ts, ts))
+            per_day[day] = (count + 1, min(first, ts), max(last, ts))
+        # A day counts as active in its week and month the first time it gets an event
+        new_days = {day for (day,) in self.conn.execute(
+            "SELECT value FROM json_each(?) WHERE value NOT IN (SELECT day FROM daily)",
+            (json.dumps(list(per_day)),)
+        )}
+        for level, (table, column) in ROLLUPS.items():
+            if level == "day":
+                continue
+            per_bucket = {}
+            for day, (count, _, _) in per_day.items():
+                key = bucket_start(date.fromisoformat(day), level).isoformat()
+                poses, active = per_bucket.get(key, (0, 0))
+                per_bucket[key] = (poses + count, active + (day in new_days))
+            self.conn.executemany(
+                f"INSERT INTO {table}({column}, poses, active_days) VALUES (?, ?, ?) "
+                f"ON CONFLICT({column}) DO UPDATE SET poses = poses + excluded.poses, "
+                f"active_days = active_days + excluded.active_days",
+                [(key, *agg) for key, agg in per_bucket.items()],
+            )
+        self.conn.executemany(
+            "INSERT INTO daily(day, poses, first_ts, last_ts) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(day) DO UPDATE SET poses = poses + excluded.poses, "
+            "first_ts = min(first_ts, excluded.first_ts), last_ts = max(last_ts, excluded.last_ts)",
+            [(day, *agg) for day, agg in per_day.items()],
+        )
+
+    def add_lines(self, lines):
+        """Record log lines; lines that are not pose events are ignored. Returns the number stored.
+
+        The log writer calls this after appending the same lines to the followed
+        text log, so the import offset moves past them in the same transaction.
+        """
+        rows = [r for r in map(parse_log_line, lines) if r is not None]
+        if rows:
+            with self._lock:
+                with self.conn:
+                    self._insert(rows)
+                    if self.follow_path is not None:
+                        self._follow(self.follow_path)
+        return len(rows)
+
+    def _import_state(self, key):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            state = json.loads(row[0])
+        except ValueError:
+            return None
+        # Older stores recorded only the file size
+        return state if isinstance(state, dict) else {"offset": int(state)}
+
+    def _save_import_state(self, key, state, st):
+        state.update(size=st.st_size, mtime_ns=st.st_mtime_ns, ino=st.st_ino)
+        self.conn.execute(
+            "INSERT INTO meta(key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(state)),
+        )
+
+    def _advance(self, f, state, batch_size=5000, insert=True):
+        """Consume whole lines past state's offset, extending its CRC; insert their events when asked."""
+        f.seek(state["offset"])
+        offset, crc = state["offset"], state["crc"]
+        imported = 0
+        rows = []
+        for raw in f:
+            # A line still being written is left for the next import
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            crc = zlib.crc32(raw, crc)
+            if not insert:
+                continue
+            row = parse_log_line(raw.decode("utf-8", errors="replace"))
+            if row is None:
+                continue
+            rows.append(row)
+            if len(rows) >= batch_size:
+                self._insert(rows)
+                imported += len(rows)
+                rows = []
+        if rows:
+            self._insert(rows)
+            imported += len(rows)
+        state["offset"], state["crc"] = offset, crc
+        return imported
+
+    def _follow(self, path):
+        # The bytes past the offset are the lines add_lines() just stored
+        key = IMPORT_PREFIX + os.path.abspath(path)
+        try:
+            with open(path, "rb") as f:
+                state = self._import_state(key) or {"offset": 0, "crc": 0}
+                if "crc" not in state:
+                    state["crc"] = prefix_crc(f, state["offset"])
+                self._advance(f, state, insert=False)
+                self._save_import_state(key, state, os.fstat(f.fileno()))
+        except OSError:
+            pass
+
+    def _clear(self):
+        for table in ("events", "daily", "weekly", "monthly"):
+            self.conn.execute(f"DELETE FROM {table}")
+        self.conn.execute("DELETE FROM meta WHERE key LIKE ?", (IMPORT_PREFIX + "%",))
+
+    def import_text_log(self, path, batch_size=5000):
+        """Bring the store up to date with a text log and follow it. Returns the number of events imported.
+
+        The meta table keeps the byte offset imported so far, a CRC-32 of every
+        byte before it and the file's stat. Lines appended since, for example
+        while the store was unavailable or disabled, are imported from the
+        offset. A log that shrank or was rewritten before the offset replaces the
+        store's contents. An untouched log is recognised from its stat alone.
+        """
+        key = IMPORT_PREFIX + os.path.abspath(path)
+        self.follow_path = path
+        if not os.path.exists(path):
+            return 0
+        with self._lock:
+            with self.conn:
+                state = self._import_state(key)
+                with open(path, "rb") as f:
+                    st = os.fstat(f.fileno())
+                    if state is not None and all(state.get(k) == v for k, v in
+                                                 (("size", st.st_size), ("mtime_ns", st.st_mtime_ns), ("ino", st.st_ino))):
+                        return 0
+                    rewritten = False
+                    if state is not None:
+                        crc = prefix_crc(f, state["offset"]) if state["offset"] <= st.st_size else None
+                        # Older stores have no CRC; their recorded prefix is taken as imported
+                        rewritten = crc is None or state.setdefault("crc", crc) != crc
+                    if rewritten:
+                        print(f"[History] {path} was rewritten, rebuilding the store from it")
+                        self._clear()
+                    if state is None or rewritten:
+                        state = {"offset": 0, "crc": 0}
+                    imported = self._advance(f, state, batch_size)
+                    self._save_import_state(key, state, st)
+        return imported
+
+    def daily_counts(self, start=None, end=None):
+        """[(date, poses)] for days with events, ordered by day. start/end are inclusive dates."""
+        sql = "SELECT day, poses FROM daily"
+        where, params = self._day_range(start, end)
+        with self._lock:
+            rows = self.conn.execute(sql + where + " ORDER BY day", params).fetchall()
+        return [(date.fromisoformat(day), poses) for day, poses in rows]
+
+    def bucket_counts(self, level, start=None, end=None):
+        """[(bucket start date, poses, active days)] at level "day", "week" or "month".
+
+        start/end are inclusive dates; buckets are selected by their start date.
+        """
+        table, column = ROLLUPS[level]
+        active = "1" if level == "day" else "active_days"
+        where, params = self._day_range(start, end, column=column)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {column}, poses, {active} FROM {table}{where} ORDER BY {column}", params
+            ).fetchall()
+        return [(date.fromisoformat(key), poses, days) for key, poses, days in rows]
+
+    def events(self, start=None, end=None, limit=None):
+        """[(datetime, set, round, message)] ordered by time. start/end are inclusive dates."""
+        sql = "SELECT ts, set_no, round_no, message FROM events"
+        where, params = self._day_range(start, end, column="ts")
+        sql += where + " ORDER BY ts"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [(datetime.strptime(ts, TIMESTAMP_FORMAT), s, r, m) for ts, s, r, m in rows]
+
+    def tail_lines(self, limit):
+        """The last limit events formatted as text log lines, oldest first."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT ts, set_no, round_no, message FROM events ORDER BY ts DESC, id DESC LIMIT ?", (int(limit),)
+            ).fetchall()
+        return [f"[{ts}] เซ็ตที่ {s} ครั้งที่ {r} : {m}\n" for ts, s, r, m in reversed(rows)]
+
+    def last_event_id(self):
+        """Id of the newest event, 0 when empty; changes whenever events are added."""
+        with self._lock:
+            return self.conn.execute("SELECT coalesce(max(id), 0) FROM events").fetchone()[0]
+
+    def date_range(self):
+        """(first, last) day with events, or None when the store is empty."""
+        with self._lock:
+            first, last = self.conn.execute("SELECT min(day), max(day) FROM daily").fetchone()
+        if first is None:
+            return None
+        return date.fromisoformat(first), date.fromisoformat(last)
+
+    @staticmethod
+    def _day_range(start, end, column="day"):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(start.isoformat())
+        if end is not None:
+            # Compare against the next day so ts values on the end day are included
+            clauses.append(f"{column} < ?")
+            params.append((end + timedelta(days=1)).isoformat())
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,188 @@
+import os
+from collections import deque
+
+
+class TailReader:
+    """Reads whole lines of a text file backwards or forwards from a byte offset.
+
+    Only the blocks needed for the requested lines are read, so the cost does not
+    depend on the size of the file.
+    """
+
+    def __init__(self, path, block_size=64 * 1024):
+        self.path = path
+        self.block_size = block_size
+
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _split(data):
+        parts = data.split(b"\n")
+        lines = [p + b"\n" for p in parts[:-1]]
+        if parts[-1]:
+            lines.append(parts[-1])
+        return lines
+
+    def lines_before(self, end, count):
+        """Up to count lines ending at byte offset end, as (start offset, lines)."""
+        chunks = []
+        pos = end
+        newlines = 0
+        with open(self.path, "rb") as f:
+            # count + 1 newlines guarantee count complete lines before end
+            while pos > 0 and newlines <= count:
+                size = min(self.block_size, pos)
+                pos -= size
+                f.seek(pos)
+                block = f.read(size)
+                chunks.append(block)
+                newlines += block.count(b"\n")
+        lines = self._split(b"".join(reversed(chunks)))
+        start = pos
+        if pos > 0 and lines:
+            # The first piece starts mid-line
+            start += len(lines.pop(0))
+        if len(lines) > count:
+            start += sum(len(line) for line in lines[:-count])
+            lines = lines[-count:]
+        return start, [line.decode("utf-8", "replace") for line in lines]
+
+    def lines_after(self, start, count, limit=None):
+        """Up to count lines starting at byte offset start, as (end offset, lines).
+
+        Reading stops at limit (default: the current size); a final line without a
+        newline is only returned when it ends exactly at limit.
+        """
+        limit = self.size() if limit is None else limit
+        chunks = []
+        pos = start
+        newlines = 0
+        with open(self.path, "rb") as f:
+            f.seek(pos)
+            while pos < limit and newlines < count:
+                block = f.read(min(self.block_size, limit - pos))
+                if not block:
+                    break
+                chunks.append(block)
+                pos += len(block)
+                newlines += block.count(b"\n")
+        lines = self._split(b"".join(chunks))
+        if lines and not lines[-1].endswith(b"\n") and (pos < limit or len(lines) > count):
+            lines.pop()
+        lines = lines[:count]
+        end = start + sum(len(line) for line in lines)
+        return end, [line.decode("utf-8", "replace") for line in lines]
+
+
+class HistoryView:
+    """Paged view of the end of a log file in a (CTk)Textbox.
+
+    Opening reads only the last page. Older pages are read when the view is
+    scrolled to the top and newer ones again when it reaches the bottom. At most
+    max_pages pages stay in the widget; the page furthest from the view is
+    dropped, so the widget never holds the whole log.
+    """
+
+    def __init__(self, textbox, page_lines=200, max_pages=5, poll_ms=150):
+        self.textbox = textbox
+        self.page_lines = page_lines
+        self.max_pages = max_pages
+        self.poll_ms = poll_ms
+        self.reader = None
+        self.limit = 0
+        # (start offset, end offset, line count) per page, oldest first
+        self.pages = deque()
+        self._job = None
+
+    def open(self, path, fallback=None):
+        """Show the last page of path, or the fallback lines when the file is missing."""
+        self.close()
+        self.pages.clear()
+        if os.path.exists(path):
+            self.reader = TailReader(path)
+            self.limit = self.reader.size()
+            start, lines = self.reader.lines_before(self.limit, self.page_lines)
+            self.pages.append((start, self.limit, len(lines)))
+        else:
+            self.reader = None
+            lines = list(fallback or [])
+        if not lines:
+            lines = ["No history found.\n"]
+        self._edit(lambda: (self.textbox.delete("1.0", "end"), self.textbox.insert("end", "".join(lines))))
+        self.textbox.see("end")
+        if self.reader is not None:
+            self._job = self.textbox.after(self.poll_ms, self._poll)
+
+    def close(self):
+        if self._job is not None:
+            try:
+                self.textbox.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def _edit(self, fn):
+        self.textbox.configure(state="normal")
+        try:
+            fn()
+        finally:
+            self.textbox.configure(state="disabled")
+
+    def _top_line(self):
+        return int(self.textbox.index("@0,0").split(".")[0])
+
+    def _poll(self):
+        self._job = None
+        try:
+            top, bottom = self.textbox.yview()
+            if top <= 0.0 and self.pages and self.pages[0][0] > 0:
+                self._load_older()
+            elif bottom >= 1.0 and self.pages and self.pages[-1][1] < self.reader.size():
+                self._load_newer()
+        except Exception as e:
+            print(f"[History] {e}")
+        self._job = self.textbox.after(self.poll_ms, self._poll)
+
+    def _load_older(self):
+        first_start = self.pages[0][0]
+        start, lines = self.reader.lines_before(first_start, self.page_lines)
+        if not lines:
+            return
+        top = self._top_line()
+
+        def edit():
+            self.textbox.insert("1.0", "".join(lines))
+            if len(self.pages) >= self.max_pages:
+                total = sum(n for _, _, n in self.pages) + len(lines)
+                dropped = self.pages.pop()
+                self.textbox.delete(f"{total - dropped[2] + 1}.0", "end")
+
+        self._edit(edit)
+        self.pages.appendleft((start, first_start, len(lines)))
+        # Keep the line that was at the top in place
+        self.textbox.yview(f"{top + len(lines)}.0")
+
+    def _load_newer(self):
+        last_end = self.pages[-1][1]
+        self.limit = self.reader.size()
+        end, lines = self.reader.lines_after(last_end, self.page_lines, self.limit)
+        if not lines:
+            return
+        top = self._top_line()
+        removed = 0
+
+        def edit():
+            nonlocal removed
+            self.textbox.insert("end", "".join(lines))
+            if len(self.pages) >= self.max_pages:
+                dropped = self.pages.popleft()
+                removed = dropped[2]
+                self.textbox.delete("1.0", f"{removed + 1}.0")
+
+        self._edit(edit)
+        self.pages.append((last_end, end, len(lines)))
+        self.textbox.yview(f"{max(1, top - removed)}.0")
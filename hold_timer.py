@@ -0,0 +1,86 @@
+import math
+import threading
+
+
+class HoldTimer:
+    """Hold accounting driven by capture frame timestamps.
+
+    Called once per processed frame from the detection thread. A hold starts after
+    confirm_frames consecutive matched frames. Matched time then accumulates from
+    frame timestamps; a mismatch pauses it and does not reset it, as before. update()
+    returns an event only when something the UI shows changes:
+
+      ("hold", secs)      counting started or resumed
+      ("tick", secs)      the whole seconds left changed
+      ("pause", secs)     the pose was lost, counting paused
+      ("complete", 0)     the full hold time has been reached
+
+    Every event also carries the generation it belongs to. reset() starts a new
+    generation, so the UI can drop events queued for a hold it already reset.
+    """
+
+    def __init__(self, duration, confirm_frames=5):
+        self.duration = float(duration)
+        self.confirm_frames = confirm_frames
+        self._lock = threading.Lock()
+        self.generation = 0
+        self._clear()
+
+    def _clear(self):
+        self._held = 0.0
+        self._since = None
+        self._last_matched = None
+        self._streak = 0
+        self._secs = int(math.ceil(self.duration))
+        self.done = False
+
+    def reset(self):
+        with self._lock:
+            self.generation += 1
+            self._clear()
+
+    @property
+    def holding(self):
+        return self._since is not None
+
+    def update(self, matched, t):
+        with self._lock:
+            if self.done:
+                return None
+            if not matched:
+                self._streak = 0
+                if self._since is None:
+                    return None
+                # Count the hold up to the last matched frame
+                self._held += self._last_matched - self._since
+                self._since = None
+                return ("pause", self._secs, self.generation)
+
+            self._streak += 1
+            self._last_matched = t
+            if self._since is None:
+                if self._streak < self.confirm_frames:
+                    return None
+                self._since = t
+                return ("hold", self._secs, self.generation)
+
+            elapsed = self._held + t - self._since
+            if elapsed >= self.duration:
+                self._held = self.duration
+                self._since = None
+                self._secs = 0
+                self.done = True
+                return ("complete", 0, self.generation)
+            secs = int(math.ceil(self.duration - elapsed))
+            if secs != self._secs:
+                self._secs = secs
+                return ("tick", secs, self.generation)
+            return None
+
+    def progress(self, now):
+        """Fraction of the hold completed at perf_counter() time now"""
+        with self._lock:
+            elapsed = self._held
+            if self._since is not None:
+                elapsed += max(0.0, now - self._since)
+            return min(1.0, elapsed / self.duration) if self.duration > 0 else 1.0
@@ -0,0 +1,112 @@
+"""Hand-landmark inference in a separate process.
+
+Frames go to the worker through a shared-memory buffer (one copy, no pickling).
+Only the landmark coordinates and the worker's stage timings come back over the pipe. The UI process then draws
+and classifies them itself. InferenceWorkerClient has the same detect()/draw()/close()
+surface as HandDetector, so _mediapipe_loop works with either.
+"""
+import multiprocessing
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+from detection import HandDetector, draw_hand
+from roi import HandROITracker
+
+
+def _worker_main(conn, roi_tracking, roi_padding):
+    tracker = HandROITracker(padding=roi_padding) if roi_tracking else None
+    detector = HandDetector(tracker=tracker)
+    shm = None
+    frame = None
+    try:
+        while True:
+            msg = conn.recv()
+            if msg is None:
+                break
+            if msg[0] == "attach":
+                if shm is not None:
+                    shm.close()
+                shm = shared_memory.SharedMemory(name=msg[1])
+                frame = np.ndarray(msg[2], dtype=np.uint8, buffer=shm.buf)
+            elif msg[0] == "detect":
+                timings = {}
+                results = detector.detect(frame, timings)
+                hands = [
+                    np.array([(p.x, p.y, p.z) for p in hl.landmark], dtype=np.float32)
+                    for hl in (results.multi_hand_landmarks or [])
+                ]
+                conn.send((hands, timings))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        frame = None
+        detector.close()
+        if shm is not None:
+            shm.close()
+
+
+def _to_landmark_list(arr):
+    return landmark_pb2.NormalizedLandmarkList(landmark=[
+        landmark_pb2.NormalizedLandmark(x=float(x), y=float(y), z=float(z)) for x, y, z in arr
+    ])
+
+
+class InferenceWorkerClient:
+    def __init__(self, roi_tracking=False, roi_padding=0.35, timeout=5.0):
+        self.timeout = timeout
+        # spawn: forking a process that already runs Tk and several threads is unsafe
+        ctx = multiprocessing.get_context("spawn")
+        self._conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, roi_tracking, roi_padding),
+            name="inference-worker", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self._shm = None
+        self._frame = None
+        # Worker startup includes loading the model, allow it more time on the first call
+        self._first_call = True
+
+    def _attach(self, shape):
+        if self._shm is not None:
+            self._frame = None
+            self._shm.close()
+            self._shm.unlink()
+        size = int(np.prod(shape))
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self._frame = np.ndarray(shape, dtype=np.uint8, buffer=self._shm.buf)
+        self._conn.send(("attach", self._shm.name, shape))
+
+    def detect(self, frame, timings=None):
+        if self._frame is None or self._frame.shape != frame.shape:
+            self._attach(frame.shape)
+        np.copyto(self._frame, frame)
+        self._conn.send(("detect",))
+        timeout = max(self.timeout, 60.0) if self._first_call else self.timeout
+        if not self._conn.poll(timeout):
+            raise TimeoutError("inference worker did not answer")
+        self._first_call = False
+        hands, worker_timings = self._conn.recv()
+        if timings is not None:
+            timings.update(worker_timings)
+        return SimpleNamespace(multi_hand_landmarks=[_to_landmark_list(arr) for arr in hands] or None)
+
+    def draw(self, frame, hand_landmarks):
+        draw_hand(frame, hand_landmarks)
+
+    def close(self):
+        try:
+            self._conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.terminate()
+        self._conn.close()
+        if self._shm is not None:
+            self._frame = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
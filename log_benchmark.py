@@ -0,0 +1,131 @@
+"""Compare the strptime log reader with the memory-mapped bulk parser on a large log and report JSON.
+
+    python log_benchmark.py --lines 3000000 --output log_bench.json
+    python log_benchmark.py --log Anti-Finger.txt
+"""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+import numpy as np
+from log_parser import parse_log
+
+EXERCISES = [
+    "ท่าเหยียดมือตรงสำเร็จ!",
+    "ท่าทำมือคล้ายตะขอสำเร็จ!",
+    "ท่ากำมือสำเร็จ!",
+    "ท่ากำมือแบบเหยียดปลายนิ้วสำเร็จ!",
+    "ท่างอโคนนิ้วแต่เหยียดปลายนิ้วมือสำเร็จ!",
+]
+
+
+def write_synthetic_log(path, lines):
+    """Write a log in the write_log layout: 150 events a day, 7 s apart."""
+    start = datetime(2020, 1, 1, 8, 0, 0)
+    per_day = 150
+    with open(path, "w", encoding="utf-8") as f:
+        batch = []
+        for i in range(lines):
+            day, n = divmod(i, per_day)
+            ts = start + timedelta(days=day, seconds=n * 7)
+            set_no, rest = divmod(n, 50)
+            round_no, pose = divmod(rest, 5)
+            batch.append(f"[{ts:%Y-%m-%d %H:%M:%S}] เซ็ตที่ {set_no + 1} ครั้งที่ {round_no + 1} : {EXERCISES[pose]}\n")
+            if len(batch) >= 100000:
+                f.writelines(batch)
+                batch = []
+        f.writelines(batch)
+
+
+def legacy_daily_counts(path):
+    # The per-line reader used by get_history_from_file
+    daily = defaultdict(int)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                date_str = line.split("]")[0][1:]
+                daily[datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S").date()] += 1
+            except Exception:
+                continue
+    return dict(daily)
+
+
+def bulk_daily_counts(path):
+    return parse_log(path, fields=False).daily_counts()
+
+
+def bulk_columns(path):
+    return parse_log(path)
+
+
+def best_of(fn, path, repeat):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(path)
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark exercise log parsing")
+    parser.add_argument("--log", help="existing log to parse instead of a synthetic one")
+    parser.add_argument("--lines", type=int, default=3000000, help="lines in the synthetic log")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per parser, the best is reported")
+    parser.add_argument("--skip-legacy", action="store_true", help="time only the bulk parser")
+    parser.add_argument("--output", "-o", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    tmpdir = None
+    path = args.log
+    if path is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(tmpdir.name, "Anti-Finger.txt")
+        write_synthetic_log(path, args.lines)
+
+    try:
+        size = os.path.getsize(path)
+        bulk_s, bulk = best_of(bulk_daily_counts, path, args.repeat)
+        columns_s, columns = best_of(bulk_columns, path, args.repeat)
+        report = {
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "machine": platform.machine(),
+                "numpy": np.__version__,
+            },
+            "log": args.log or "synthetic",
+            "bytes": size,
+            "events": len(columns),
+            "days": len(bulk),
+            "messages": len(columns.messages),
+            "bulk_s": bulk_s,
+            "bulk_mb_per_s": size / bulk_s / 1e6 if bulk_s > 0 else None,
+            "bulk_with_fields_s": columns_s,
+        }
+        if not args.skip_legacy:
+            legacy_s, legacy = best_of(legacy_daily_counts, path, args.repeat)
+            report.update({
+                "legacy_s": legacy_s,
+                "speedup": legacy_s / bulk_s if bulk_s > 0 else None,
+                "counts_match": legacy == bulk,
+            })
+    finally:
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+import mmap
+import os
+import numpy as np
+
+# Fixed-width "[YYYY-MM-DD HH:MM:SS]" prefix: byte offsets of the 14 digits and the separators
+TS_WIDTH = 21
+TS_DIGITS = np.array([1, 2, 3, 4, 6, 7, 9, 10, 12, 13, 15, 16, 18, 19])
+TS_SEPARATORS = {0: b"[", 5: b"-", 8: b"-", 11: b" ", 14: b":", 17: b":", 20: b"]"}
+
+SET_LABEL = np.frombuffer(" เซ็ตที่ ".encode("utf-8"), dtype=np.uint8)
+ROUND_LABEL = np.frombuffer(" ครั้งที่ ".encode("utf-8"), dtype=np.uint8)
+MESSAGE_SEP = np.frombuffer(b" : ", dtype=np.uint8)
+MAX_NUMBER_DIGITS = 6
+# Message bytes beyond this are not used to tell messages apart
+MAX_MESSAGE_BYTES = 256
+# Lines decoded per vectorized pass, bounds the temporary arrays
+CHUNK_LINES = 1 << 18
+
+_FNV_OFFSET = np.uint64(1469598103934665603)
+_FNV_PRIME = np.uint64(1099511628211)
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+class LogColumns:
+    """Column arrays of the event lines of an exercise log, one row per line.
+
+    ts is datetime64[s]. set_no and round_no are -1 and pose is -1 on lines
+    whose text after the timestamp does not follow the write_log layout.
+    pose indexes messages, the distinct message texts in first-seen order.
+    """
+
+    def __init__(self, ts, set_no, round_no, pose, messages):
+        self.ts = ts
+        self.set_no = set_no
+        self.round_no = round_no
+        self.pose = pose
+        self.messages = messages
+
+    def __len__(self):
+        return len(self.ts)
+
+    def daily_counts(self):
+        """{date: events} for every day with at least one event."""
+        days, counts = np.unique(self.ts.astype("datetime64[D]"), return_counts=True)
+        return {d.item(): int(n) for d, n in zip(days, counts)}
+
+
+def _words_at(buf, pos):
+    """Little-endian uint64 of the 8 bytes starting at each pos; bytes past the buffer end read as 0."""
+    if len(buf) < 8:
+        buf = np.concatenate([buf, np.zeros(8 - len(buf), dtype=np.uint8)])
+    # Overlapping, unaligned view: element i is the word starting at byte i
+    words = np.ndarray((len(buf) - 7,), dtype="<u8", buffer=buf, strides=(1,))
+    last = len(buf) - 8
+    clipped = np.minimum(pos, last)
+    return words[clipped] >> ((pos - clipped) * 8).astype(np.uint64)
+
+
+def _window(buf, pos, width):
+    """(len(pos), width) bytes starting at each pos, gathered a word at a time."""
+    words = [_words_at(buf, pos + i) for i in range(0, width, 8)]
+    return np.stack(words, axis=1).astype("<u8").view(np.uint8)[:, :width]
+
+
+def _label_at(buf, pos, end, label):
+    return (pos + len(label) <= end) & (_window(buf, pos, len(label)) == label).all(axis=1)
+
+
+def _number_at(buf, pos, end):
+    """Unsigned decimal at pos, as (value, digit count); count 0 means no number."""
+    digits = _window(buf, pos, MAX_NUMBER_DIGITS).astype(np.int64) - 48
+    idx = pos[:, None] + np.arange(MAX_NUMBER_DIGITS)
+    run = np.cumprod((digits >= 0) & (digits <= 9) & (idx < end[:, None]), axis=1).astype(bool)
+    value = np.zeros(len(pos), dtype=np.int64)
+    for j in range(MAX_NUMBER_DIGITS):
+        value = np.where(run[:, j], value * 10 + digits[:, j], value)
+    return value, run.sum(axis=1)
+
+
+def _parse_timestamps(buf, starts, ends):
+    """datetime64[s] per line and the mask of lines with a valid timestamp prefix."""
+    head = _window(buf, starts, TS_WIDTH)
+    ok = (ends - starts) >= TS_WIDTH
+    for offset, char in TS_SEPARATORS.items():
+        ok &= head[:, offset] == ord(char)
+    d = head[:, TS_DIGITS].astype(np.int64) - 48
+    ok &= ((d >= 0) & (d <= 9)).all(axis=1)
+    year = d[:, 0] * 1000 + d[:, 1] * 100 + d[:, 2] * 10 + d[:, 3]
+    month = d[:, 4] * 10 + d[:, 5]
+    day = d[:, 6] * 10 + d[:, 7]
+    hour = d[:, 8] * 10 + d[:, 9]
+    minute = d[:, 10] * 10 + d[:, 11]
+    second = d[:, 12] * 10 + d[:, 13]
+    ok &= (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31) & (hour < 24) & (minute < 60) & (second < 60)
+    months = np.where(ok, (year - 1970) * 12 + month - 1, 0).astype("datetime64[M]")
+    days = months.astype("datetime64[D]") + np.where(ok, day - 1, 0)
+    # Reject days past the end of their month, e.g. 02-30
+    ok &= days.astype("datetime64[M]") == months
+    ts = days.astype("datetime64[s]") + (hour * 3600 + minute * 60 + second)
+    return ts, ok
+
+
+def _parse_chunk(buf, starts, ends, fields):
+    ts, ok = _parse_timestamps(buf, starts, ends)
+    ts, starts, ends = ts[ok], starts[ok], ends[ok]
+    n = len(ts)
+    if not fields:
+        missing = np.full(n, -1, dtype=np.int64)
+        return ts, missing, missing, np.zeros(n, dtype=np.uint64), np.zeros(n, dtype=bool), starts, starts
+
+    pos = starts + TS_WIDTH
+    fields = _label_at(buf, pos, ends, SET_LABEL)
+    set_no, width = _number_at(buf, pos + len(SET_LABEL), ends)
+    fields &= width > 0
+    pos = pos + len(SET_LABEL) + width
+    fields &= _label_at(buf, pos, ends, ROUND_LABEL)
+    round_no, width = _number_at(buf, pos + len(ROUND_LABEL), ends)
+    fields &= width > 0
+    pos = pos + len(ROUND_LABEL) + width
+    fields &= _label_at(buf, pos, ends, MESSAGE_SEP)
+    msg_start = pos + len(MESSAGE_SEP)
+    msg_len = np.where(fields, np.clip(ends - msg_start, 0, MAX_MESSAGE_BYTES), 0)
+
+    # FNV-style hash over the message, eight bytes per vectorized step
+    digest = np.full(n, _FNV_OFFSET, dtype=np.uint64) ^ msg_len.astype(np.uint64)
+    for j in range(0, int(msg_len.max()) if n else 0, 8):
+        remaining = np.clip(msg_len - j, 0, 8).astype(np.uint64)
+        mask = np.where(remaining == 8, _ALL_ONES, (np.uint64(1) << (remaining * np.uint64(8))) - np.uint64(1))
+        mixed = (digest ^ (_words_at(buf, msg_start + j) & mask)) * _FNV_PRIME
+        digest = np.where(remaining > 0, mixed ^ (mixed >> np.uint64(29)), digest)
+
+    return (ts, np.where(fields, set_no, -1), np.where(fields, round_no, -1),
+            digest, fields, msg_start, msg_start + msg_len)
+
+
+def parse_buffer(buf, fields=True):
+    """Parse log bytes (bytes, mmap or a uint8 array) into LogColumns.
+
+    Only lines that start with a well-formed "[YYYY-MM-DD HH:MM:SS]" are kept,
+    the same lines the strptime-based readers count. fields=False decodes the
+    timestamps only, which is all daily counts need.
+    """
+    if not isinstance(buf, np.ndarray):
+        buf = np.frombuffer(buf, dtype=np.uint8)
+    if len(buf) == 0:
+        return LogColumns(np.array([], dtype="datetime64[s]"), np.array([], dtype=np.int64),
+                          np.array([], dtype=np.int64), np.array([], dtype=np.int64), [])
+    ends = np.flatnonzero(buf == ord("\n"))
+    if buf[-1] != ord("\n"):
+        ends = np.append(ends, len(buf))
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    # CRLF logs written on Windows
+    ends = ends - (buf[np.maximum(ends - 1, 0)] == ord("\r")) * (ends > starts)
+
+    parts = [_parse_chunk(buf, starts[i:i + CHUNK_LINES], ends[i:i + CHUNK_LINES], fields)
+             for i in range(0, len(starts), CHUNK_LINES)]
+    ts, set_no, round_no, digest, fields, msg_start, msg_end = (np.concatenate(col) for col in zip(*parts))
+
+    pose = np.full(len(ts), -1, dtype=np.int64)
+    messages = []
+    if fields.any():
+        rows = np.flatnonzero(fields)
+        _, first, inverse = np.unique(digest[rows], return_index=True, return_inverse=True)
+        # Number messages in the order they first appear in the log
+        order = np.argsort(first, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        pose[rows] = rank[inverse.ravel()]
+        messages = [bytes(buf[msg_start[rows[i]]:msg_end[rows[i]]]).decode("utf-8", "replace")
+                    for i in first[order]]
+    return LogColumns(ts, set_no, round_no, pose, messages)
+
+
+def parse_log(path, fields=True):
+    """Memory-map a log file and parse it with parse_buffer()."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return parse_buffer(b"", fields)
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                return parse_buffer(buf, fields)
+            finally:
+                # The mmap can only close once no array views it
+                del buf
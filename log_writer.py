@@ -0,0 +1,179 @@
+import os
+import queue
+import threading
+import time
+
+FSYNC_POLICIES = ("always", "interval", "never")
+_CLOSE = object()
+
+
+class LogWriter:
+    """Appends lines to a text file from a background thread.
+
+    Lines go through a bounded queue of max_queue entries and are written in
+    batches. write() never blocks: when the queue is full the line is dropped,
+    counted in stats()["dropped"] and write() returns False so the caller can
+    tell the user. At one line per pose, a full queue means the writer is stuck,
+    not merely busy. Every batch is flushed to the OS, so other readers of the
+    file see it right away. The fsync policy decides when it reaches the disk:
+    "always" after every batch, "interval" at most fsync_interval seconds after a
+    write, "never" leaves it to the OS. flush() waits only for the hand-off to
+    the OS; close() always fsyncs.
+
+    Each written batch is also handed to every listener, on the writer thread.
+    With path=None only the listeners receive the lines.
+    """
+
+    def __init__(self, path, fsync="interval", fsync_interval=1.0, max_queue=1024, batch_size=64, echo=False,
+                 listeners=()):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync policy must be one of {FSYNC_POLICIES}, got {fsync!r}")
+        self.path = path
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        self.echo = echo
+        self.listeners = list(listeners)
+        self.written = 0
+        self.batches = 0
+        self.syncs = 0
+        self.errors = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, line):
+        """Queue one line (without newline). Never blocks; False when the line was dropped."""
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def queued(self):
+        """Lines and markers not yet taken by the writer thread."""
+        return self._queue.qsize()
+
+    def flush(self, timeout=2.0):
+        """Wait until everything queued so far is handed to the OS (no fsync). Returns False on timeout."""
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout=2.0):
+        """Write what is queued, fsync and stop the thread."""
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_CLOSE, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _sync(self):
+        if self._file is not None:
+            try:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self.syncs += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"[Log] fsync error: {e}")
+
+    def _write_batch(self, lines):
+        """Write one batch; True when it went to the file and may need an fsync.
+
+        Listeners run after the file write, so they see the file with the batch in it.
+        """
+        wrote_file = False
+        file_error = False
+        if self.path is not None:
+            try:
+                f = self._open()
+                f.write("\n".join(lines) + "\n")
+                f.flush()
+                wrote_file = True
+            except Exception as e:
+                self.errors += 1
+                file_error = True
+                print(f"Error writing log: {e}")
+                # Reopen on the next batch
+                try:
+                    self._file.close()
+                except Exception:
+                    pass
+                self._file = None
+        for listener in self.listeners:
+            try:
+                listener(lines)
+            except Exception as e:
+                self.errors += 1
+                print(f"[Log] listener error: {e}")
+        if file_error:
+            return False
+        self.written += len(lines)
+        self.batches += 1
+        if self.echo:
+            for line in lines:
+                print(line)
+        return wrote_file
+
+    def _run(self):
+        sync_due = None
+        while True:
+            timeout = None if sync_due is None else max(0.0, sync_due - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._sync()
+                sync_due = None
+                continue
+
+            items = [item]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = [i for i in items if isinstance(i, str)]
+            waiters = [i for i in items if isinstance(i, threading.Event)]
+            closing = any(i is _CLOSE for i in items)
+
+            if lines and self._write_batch(lines):
+                if self.fsync == "always":
+                    self._sync()
+                elif self.fsync == "interval" and sync_due is None:
+                    sync_due = time.monotonic() + self.fsync_interval
+            # Waiters only need the batch in the OS, which _write_batch already did
+            if closing:
+                self._sync()
+                sync_due = None
+            for w in waiters:
+                w.set()
+            if closing:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def stats(self):
+        return {
+            "written": self.written,
+            "batches": self.batches,
+            "syncs": self.syncs,
+            "queued": self.queued(),
+            "dropped": self.dropped,
+            "errors": self.errors,
+        }
@@ -2,19 +2,39 @@ from logging import root
 from PIL import Image, ImageTk
 import customtkinter as ctk
 import cv2
-import mediapipe as mp
 import pygame
 import time, threading
-from datetime import datetime, timedelta
+from datetime import datetime
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+from matplotlib.figure import Figure
 import matplotlib.font_manager as fm
-from collections import defaultdict
 import sys, os
 import tkinter as tk
 from tkinter import ttk
 import math
+import multiprocessing
+import settings
+from frame_source import open_frame_source
+from capture import CaptureThread
+from detection import HandDetector, hand_angles, draw_match
+from classifier import PoseClassifier
+from display import PreviewRenderer
+from roi import HandROITracker
+from cadence import InferenceCadence
+from inference_worker import InferenceWorkerClient
+from pacing import FramePacer
+from smoothing import AngleFilter, MatchHysteresis
+from hold_timer import HoldTimer
+from timer_widget import AnimationClock, TimerRing
+from log_writer import LogWriter
+from history_store import HistoryStore
+from analytics import ProgressAnalytics
+from history_view import HistoryView
+from profiles import ProfileRegistry
+from progress_chart import ProgressPlot, TimelineZoom
+from history_series import choose_level
+from audio import AudioEngine, PRIORITY_CONTROL, PRIORITY_PROMPT, PRIORITY_NAVIGATION
+from tracing import tracer
 
 class AntiTriggerFingersApp(ctk.CTk):
 
@@ -47,32 +67,34 @@ class AntiTriggerFingersApp(ctk.CTk):
         self.key_held = False
         self.time_max = 5
         self.time_current = self.time_max
-        self.hand_posit = 0
         self.still_hold = False
         self.current_pose = 1
         self.key = ""
         self.is_pass = False
         self.round = 0
         self.set = 0
-        self.pose_name = [
-            "placeholder",
-            "เหยียดมือตรง",
-            "ทำมือคล้ายตะขอ",
-            "กำมือ",
-            "กำมือแบบเหยียดปลายนิ้ว",
-            "งอโค้นนิ้วแต่เหยียดปลายนิ้วมือ"
-        ]
+        # Patient profiles; counters and history belong to the active one
+        self.profiles = ProfileRegistry(settings.PROFILES_DIR, settings.LOG_FILE, settings.HISTORY_DB)
+        self.profile = self.profiles.active()
+        self.round, self.set, self.current_pose = self.profile.round, self.profile.set, self.profile.current_pose
+        # Exercise definitions (names, example images, sounds, angle ranges) from poses.json
+        self.poses = PoseClassifier.from_file(settings.POSE_FILE)
+        self.pose_name = ["placeholder"] + self.poses.names
         self.extent = 0
         self.progress = 0
+        # Hold progress is accounted on the detection thread from frame timestamps
+        self.hold_timer = HoldTimer(self.time_max)
+
+        if settings.TRACE_FILE:
+            tracer.start(settings.TRACE_FILE)
 
         # --- Camera Setup ---
-        self.cap = cv2.VideoCapture(0)
+        self.cap = open_frame_source(
+            settings.FRAME_SOURCE, realtime=settings.REPLAY_REALTIME,
+            loop=settings.REPLAY_LOOP, fps=settings.REPLAY_FPS
+        )
         if not self.cap.isOpened():
-            print("Error: Cannot open webcam")
-        else:
-            # Try to set camera to a decent resolution, will be resized later
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+            print(f"Error: Cannot open frame source {settings.FRAME_SOURCE}")
 
         # --- UI Colors ---
         self.purple_bg = "#6a0dad"
@@ -86,6 +108,8 @@ class AntiTriggerFingersApp(ctk.CTk):
         self.hover_green_bt = "#247539"
         self.white_fg = "#ffffff"
         self.black_fg = "black"
+        self.timer_hold_color = "#3CB371"
+        self.timer_countdown_color = "#FFA500"
 
         # --- Scaled Fonts ---
         self.font_large_title = ("Sarabun", int(60 * self.u_scale), "bold")
@@ -135,6 +159,21 @@ class AntiTriggerFingersApp(ctk.CTk):
         )
         self.app_title_label.pack(side="left", padx=20, pady=10)
 
+        self.profile_add_button = ctk.CTkButton(
+            self.top_bar_frame, text="+", width=int(60 * self.u_scale), font=self.font_small,
+            fg_color=self.white_fg, text_color=self.purple_bg, hover_color=self.light_gray_bg,
+            command=self.add_profile,
+        )
+        self.profile_add_button.pack(side="right", padx=(5, 20), pady=10)
+        self.profile_var = ctk.StringVar(value="")
+        self.profile_menu = ctk.CTkOptionMenu(
+            self.top_bar_frame, variable=self.profile_var, values=[], font=self.font_small,
+            dropdown_font=self.font_small, width=int(350 * self.u_scale),
+            command=self._on_profile_selected,
+        )
+        self.profile_menu.pack(side="right", padx=5, pady=10)
+        self._refresh_profile_menu()
+
         # Main Content Grid
         self.main_content_frame = ctk.CTkFrame(self, fg_color=self.light_gray_bg_program)
         self.main_content_frame.pack(side="top", fill="both", expand=True, pady=int(20 * self.scale_h))
@@ -262,24 +301,17 @@ class AntiTriggerFingersApp(ctk.CTk):
         )
         self.timer_canvas.pack()
         
-        left = self.timer_pad
-        top = self.timer_pad
-        right = self.timer_canvas_size - self.timer_pad
-        bottom = self.timer_canvas_size - self.timer_pad
-        self.timer_canvas.create_oval(left, top, right, bottom, outline="#3CB371", width=10, tags="progress")
-        center = self.timer_canvas_size // 2
-        self.timer_text = self.timer_canvas.create_text(center, center, text=f"{self.time_current}", font=self.font_timer, fill=self.black_fg)
-
-        self.timer_anim_job = None
-        self._timer_anim_from = 0.0
-        self._timer_anim_to = 0.0
-        self._timer_anim_start = 0.0
-        self._timer_anim_duration = 0.0
+        # Ring and label are created once; animations only reconfigure them
+        self.timer_ring = TimerRing(self.timer_canvas, self.timer_canvas_size, self.timer_pad, self.font_timer, self.black_fg)
+        self.timer_ring.show_full(self.timer_hold_color)
+        self.timer_ring.set_text(self.time_current)
+        # Shared ~20 fps clock for the hold ring and the start countdown
+        self.animation_clock = AnimationClock(self, interval_ms=50)
 
         # Example Pose Image
         img_size = int(300 * self.u_scale)
         try:
-            small_hand_image_pil = Image.open("pictures/EX_POSE/pose1.png")
+            small_hand_image_pil = Image.open(self.poses.images[0])
             small_hand_image_pil = small_hand_image_pil.resize((img_size, img_size), Image.LANCZOS)
             self.small_hand_photo = ImageTk.PhotoImage(small_hand_image_pil)
             self.small_hand_label = ctk.CTkLabel(self.main_content_frame, image=self.small_hand_photo, text="")
@@ -325,6 +357,8 @@ class AntiTriggerFingersApp(ctk.CTk):
             fg_color="#CCC9C9",
         )
         self.history_textbox.pack(side="left", padx=int(100 * self.scale_w), pady=0)
+        # Shows the tail of the log and pages in older lines on scroll
+        self.history_view = HistoryView(self.history_textbox, page_lines=200)
 
         self.back_button = ctk.CTkButton(
             self.history_content_frame,
@@ -339,289 +373,300 @@ class AntiTriggerFingersApp(ctk.CTk):
         )
         self.back_button.pack(side="right", padx=(int(70 * self.scale_w), int(100 * self.scale_w)), pady=(int(100 * self.scale_h), 0))
 
-        self.pose_sounds = {1: ["001.mp3"], 2: ["002.mp3"], 3: ["003.mp3"], 4: ["004.mp3"], 5: ["005.mp3"]}
+        self.pose_sounds = {i: [sound] for i, sound in enumerate(self.poses.sounds, start=1) if sound}
         self.current_chart = None
+        self.chart_history = []
 
         try:
             pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
         except Exception as e:
             print(f"[Sound] Pygame mixer init error: {e}")
+        # Voices are decoded once in the background and played from one queue
+        self.audio = AudioEngine("Voices")
+        self._open_profile_history(self.profile)
 
         self.running = False
         self.countdown_active = False
-        self.countdown_job = None
         self.countdown_total = 0
         self.countdown_end_time = 0
 
+        # One thread owns the frame source; the detection thread reads its buffer
+        self.capture = CaptureThread(self.cap)
+        self.capture.start()
+
         self.mp_running = True
         self.mp_thread = threading.Thread(target=self._mediapipe_loop, daemon=True)
         self.mp_thread.start()
 
-        self.check_sensor_loop()
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
-    def get_history_from_file(self):
-        FILE_PATH = "Anti-Finger.txt"
-        DAILY_TARGET_REPS = 30
-        poses_per_rep = 5
-        reps_per_set = 10
-        daily_poses = defaultdict(int)
-
-        if not os.path.exists(FILE_PATH):
-            return []
-
+    def history_range(self):
+        """(first, last) day with logged poses, or None"""
         try:
-            with open(FILE_PATH, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or not line.startswith("["):
-                        continue
-                    try:
-                        date_str = line.split("]")[0][1:]
-                        date = datetime.strptime(date_str, "%Y-%m-%d %H:%M:%S")
-                        daily_poses[date.date()] += 1
-                    except Exception:
-                        continue
+            return self.analytics.date_range()
         except Exception as e:
-            print(f"Error reading file: {e}")
-            return []
+            print(f"Error reading history: {e}")
+            return None
 
-        if not daily_poses:
+    def get_history_from_file(self, start=None, end=None, level=None):
+        """Progress entries for [start, end] (default: all history) at day, week or month level"""
+        try:
+            return self.analytics.history(start, end, level)
+        except Exception as e:
+            print(f"Error reading history: {e}")
             return []
 
-        history = []
-        first_day = min(daily_poses.keys())
-        last_day = max(daily_poses.keys())
-        day = first_day
-
-        while day <= last_day:
-            poses = daily_poses.get(day, 0)
-            reps = poses // poses_per_rep
-            sets_done = reps // reps_per_set
-            if DAILY_TARGET_REPS > 0:
-                progress = min((reps / float(DAILY_TARGET_REPS)) * 100.0, 100.0)
-            else:
-                progress = 0.0
-
-            history.append({
-                'date': datetime.combine(day, datetime.min.time()),
-                'poses': poses,
-                'reps': reps,
-                'sets_done': sets_done,
-                'progress': progress,
-            })
-            day += timedelta(days=1)
-
-        history.sort(key=lambda x: x['date'])
-        return history
-
+    def _build_progress_chart(self):
+        """Create the chart page widgets, Figure and canvas once; refreshes only replace data"""
+        font_path = "Sarabun.ttf" 
+        
+        # ตรวจสอบว่าเจอไฟล์ไหม ถ้าไม่เจอให้ใช้ Tahoma แทน (กัน error)
+        if os.path.exists(font_path):
+            thai_font_prop = fm.FontProperties(fname=font_path, size=14)
+            title_font_prop = fm.FontProperties(fname=font_path, size=16, weight='bold')
+        else:
+            # Fallback กรณีหาไฟล์ไม่เจอ ให้ลองเรียกชื่อฟอนต์มาตรฐานใน Windows
+            print(f"Warning: Font file {font_path} not found. Using Tahoma.")
+            thai_font_prop = fm.FontProperties(family='Tahoma', size=14)
+            title_font_prop = fm.FontProperties(family='Tahoma', size=16, weight='bold')
+
+        self.chart_empty_label = tk.Label(self.chart_container, text="No data available", bg="white", font=("Sarabun", 14))
+
+        # Main frame สำหรับ chart + control
+        self.chart_main_frame = tk.Frame(self.chart_container, bg="white")
+
+        # Chart frame (ซ้าย)
+        chart_frame = tk.Frame(self.chart_main_frame, bg="white")
+        chart_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Control frame (ขวา)
+        control_frame = tk.Frame(self.chart_main_frame, bg="white", width=int(200 * self.scale_w))
+        control_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=10, pady=10)
+
+        tk.Label(control_frame, text="Select Date:", bg="white", font=("Sarabun", 14)).pack(anchor='w', pady=5)
+        self.chart_date_var = tk.StringVar()
+        self.chart_date_combo = ttk.Combobox(control_frame, textvariable=self.chart_date_var, width=15, state='readonly')
+        self.chart_date_combo.pack(anchor='w', padx=5)
+
+        tk.Label(control_frame, text="\nLegend", bg="white", font=("Sarabun", 12, "bold")).pack(anchor='w', pady=(10, 5))
+        tk.Label(control_frame, text="🔴 Red: <50%", bg="white", fg="red", font=("Sarabun", 12)).pack(anchor='w')
+        tk.Label(control_frame, text="🟢 Green: ≥50%", bg="white", fg="green", font=("Sarabun", 12)).pack(anchor='w')
+        tk.Label(control_frame, text="↑ ดีขึ้น", bg="white", fg="green", font=("Sarabun", 12)).pack(anchor='w')
+        tk.Label(control_frame, text="↓ แย่ลง", bg="white", fg="orange", font=("Sarabun", 12)).pack(anchor='w')
+
+        self.chart_feedback_label = tk.Label(control_frame, text="", bg="lightyellow", justify='left', wraplength=int(400 * self.scale_w), 
+                                 font=("Sarabun", 12), relief=tk.SUNKEN, padx=5, pady=5)
+        self.chart_feedback_label.pack(fill='x', pady=10, padx=5)
+
+        # One Figure for the life of the app, not registered with pyplot so it is never leaked
+        fig = Figure(figsize=(10, 4), dpi=80)
+        fig.patch.set_facecolor('white')
+        ax = fig.add_subplot()
+        self.progress_plot = ProgressPlot(ax, thai_font_prop, title_font_prop)
+
+        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        # Wheel zooms, drag pans; each change re-queries only the visible window
+        self.chart_zoom = TimelineZoom(canvas, self.progress_plot, self._query_chart_window)
+
+        self.chart_date_combo.bind("<<ComboboxSelected>>", self._update_chart_feedback)
+        canvas.mpl_connect("button_release_event", self._on_chart_click)
+        self.current_chart = (fig, canvas)
+
+    @tracer.traced()
+    def _query_chart_window(self, start, end):
+        level = choose_level(start, end)
+        history = self.get_history_from_file(start, end, level)
+        self.chart_history = history
+        date_list = [h['date'].strftime('%d-%b-%Y') for h in history]
+        self.chart_date_combo['values'] = date_list
+        if date_list and self.chart_date_var.get() not in date_list:
+            # Default to the newest bucket that has poses in it
+            latest = next((i for i in range(len(history) - 1, -1, -1) if history[i]['poses']), len(history) - 1)
+            self.chart_date_combo.set(date_list[latest])
+        self._update_chart_feedback()
+        return history, level
+
+    @tracer.traced()
     def draw_progress_chart(self):
         """Draw the progress chart in history page"""
-        history = self.get_history_from_file()
-        
-        # Clear previous chart
-        for widget in self.chart_container.winfo_children():
-            widget.destroy()
-
-        if not history:
-            label = tk.Label(self.chart_container, text="No data available", bg="white", font=("Sarabun", 14))
-            label.pack(fill="both", expand=True)
-            return
+        full_range = self.history_range()
 
         try:
-            font_path = "Sarabun.ttf" 
-            
-            # ตรวจสอบว่าเจอไฟล์ไหม ถ้าไม่เจอให้ใช้ Tahoma แทน (กัน error)
-            if os.path.exists(font_path):
-                thai_font_prop = fm.FontProperties(fname=font_path, size=14)
-                title_font_prop = fm.FontProperties(fname=font_path, size=16, weight='bold')
-            else:
-                # Fallback กรณีหาไฟล์ไม่เจอ ให้ลองเรียกชื่อฟอนต์มาตรฐานใน Windows
-                print(f"Warning: Font file {font_path} not found. Using Tahoma.")
-                thai_font_prop = fm.FontProperties(family='Tahoma', size=14)
-                title_font_prop = fm.FontProperties(family='Tahoma', size=16, weight='bold')
-            # -------------------------------
-
-            # Main frame สำหรับ chart + control
-            main_frame = tk.Frame(self.chart_container, bg="white")
-            main_frame.pack(fill=tk.BOTH, expand=True)
-
-            # Chart frame (ซ้าย)
-            chart_frame = tk.Frame(main_frame, bg="white")
-            chart_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-
-            # Control frame (ขวา)
-            control_frame = tk.Frame(main_frame, bg="white", width=int(200 * self.scale_w))
-            control_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=10, pady=10)
-
-            # ... (ส่วน Dropdown และ Legend เหมือนเดิม) ...
-            tk.Label(control_frame, text="Select Date:", bg="white", font=("Sarabun", 14)).pack(anchor='w', pady=5)
-            date_var = tk.StringVar()
-            date_combo = ttk.Combobox(control_frame, textvariable=date_var, width=15, state='readonly')
-            date_combo.pack(anchor='w', padx=5)
-
-            tk.Label(control_frame, text="\nLegend", bg="white", font=("Sarabun", 12, "bold")).pack(anchor='w', pady=(10, 5))
-            tk.Label(control_frame, text="🔴 Red: <50%", bg="white", fg="red", font=("Sarabun", 12)).pack(anchor='w')
-            tk.Label(control_frame, text="🟢 Green: ≥50%", bg="white", fg="green", font=("Sarabun", 12)).pack(anchor='w')
-            tk.Label(control_frame, text="↑ ดีขึ้น", bg="white", fg="green", font=("Sarabun", 12)).pack(anchor='w')
-            tk.Label(control_frame, text="↓ แย่ลง", bg="white", fg="orange", font=("Sarabun", 12)).pack(anchor='w')
-
-            feedback_label = tk.Label(control_frame, text="", bg="lightyellow", justify='left', wraplength=int(400 * self.scale_w), 
-                                     font=("Sarabun", 12), relief=tk.SUNKEN, padx=5, pady=5)
-            feedback_label.pack(fill='x', pady=10, padx=5)
-
-            # Create chart
-            fig, ax = plt.subplots(figsize=(10, 4), dpi=80) 
-            fig.patch.set_facecolor('white')
-
-            dates = [h['date'] for h in history]
-            progresses = [h['progress'] for h in history]
-
-            # Prepare OHLC data (เหมือนเดิม)
-            o, h_, l, c = [], [], [], []
-            prev = progresses[0] if progresses else 0
-            for p in progresses:
-                o.append(prev)
-                c.append(p)
-                high = max(prev, p)
-                low = min(prev, p)
-                h_.append(high)
-                l.append(low)
-                prev = p
-
-            # Draw bars (เหมือนเดิม)
-            points = []
-            for i, p in enumerate(progresses):
-                prev_prog = progresses[i-1] if i > 0 else None
-                if prev_prog is None:
-                    color = (1, 0, 0) if p < 50 else (0, 1, 0)
-                elif p > prev_prog:
-                    color = (0, 1, 0)
-                elif p < prev_prog:
-                    color = (1, 0.65, 0)
-                else:
-                    color = (1, 0, 0) if p < 50 else (0, 1, 0)
-
-                ax.vlines(dates[i], l[i], h_[i], color=color, linewidth=2)
-                ax.vlines(dates[i], o[i], c[i], color=color, linewidth=8)
-                
-                if prev_prog is not None:
-                    if p > prev_prog:
-                        # ใช้ fontproperties แทน font
-                        ax.annotate('↑', xy=(dates[i], c[i]+3), ha='center', color='green', fontproperties=thai_font_prop)
-                    elif p < prev_prog:
-                        ax.annotate('↓', xy=(dates[i], c[i]+3), ha='center', color='black', fontproperties=thai_font_prop)
-                
-                point, = ax.plot(dates[i], c[i], 'o', color='black', markersize=8)
-                points.append((point, dates[i], p, history[i]['sets_done'], i))
-
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%d-%b'))
-            
-            # --- จุดสำคัญที่แก้: ใช้ fontproperties ---
-            ax.set_ylabel("ความสำเร็จ (%)", fontproperties=thai_font_prop)
-            ax.set_title("สถิติของคุณ", fontproperties=title_font_prop)
-            # ------------------------------------
-
-            ax.set_ylim(0, 110)
-            ax.grid(True, linestyle='--', alpha=0.5)
-            fig.autofmt_xdate()
-            fig.tight_layout()
-
-            canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill="both", expand=True)
-
-            # ... (ส่วนที่เหลือเหมือนเดิม) ...
-            date_list = [h['date'].strftime('%d-%b-%Y') for h in history]
-            date_combo['values'] = date_list
-            if date_list:
-                date_combo.set(date_list[-1])
-
-            def feedback_text(prog, prev_prog):
-                # ... (Logic เหมือนเดิม) ...
-                if prog == 0: return "วันนี้คุณยังไม่ได้ทำ 🔴"
-                elif prev_prog is not None and prog < prev_prog: return "วันนี้คุณทำได้น้อยลง ↓"
-                elif prev_prog is not None and prog > prev_prog: return "วันนี้คุณทำได้ดีขึ้น ↑"
-                elif prog < 50: return "วันนี้คุณทำได้น้อยลง ↓"
-                else: return "วันนี้คุณทำได้ตามปกติ ✓"
-
-            def update_feedback(event=None):
-                # ... (Logic เหมือนเดิม) ...
-                selected_date_str = date_var.get()
-                if not selected_date_str: return
-                try:
-                    selected_date = datetime.strptime(selected_date_str, '%d-%b-%Y').date()
-                    idx = next((i for i, h in enumerate(history) if h['date'].date() == selected_date), None)
-                    if idx is not None:
-                        prog = history[idx]['progress']
-                        sets = history[idx]['sets_done']
-                        prev_prog = history[idx-1]['progress'] if idx > 0 else None
-                        fb = feedback_text(prog, prev_prog)
-                        feedback_label.config(text=f"{selected_date_str}\nProgress: {prog:.0f}%\nSets: {sets}\n{fb}")
-                except Exception as e: print(f"Error: {e}")
-
-            def on_click(event):
-                # ... (Logic เหมือนเดิม) ...
-                if event.inaxes != ax: return
-                for point, date, prog, sets, idx in points:
-                    xdata = mdates.date2num(date)
-                    ydata = prog
-                    if abs(event.xdata - xdata) < 0.3 and abs(event.ydata - ydata) < 5:
-                        prev_prog = progresses[idx-1] if idx > 0 else None
-                        fb = feedback_text(prog, prev_prog)
-                        feedback_label.config(text=f"{date.strftime('%d-%b-%Y')}\nProgress: {prog:.0f}%\nSets: {sets}\n{fb}")
-                        date_var.set(date.strftime('%d-%b-%Y'))
-                        return
-
-            date_combo.bind("<<ComboboxSelected>>", update_feedback)
-            canvas.mpl_connect("button_press_event", on_click)
-            update_feedback()
-            self.current_chart = (fig, canvas)
+            if self.current_chart is None:
+                self._build_progress_chart()
+            fig, canvas = self.current_chart
+
+            if full_range is None:
+                self.chart_main_frame.pack_forget()
+                self.chart_empty_label.configure(text="No data available", fg="black")
+                self.chart_empty_label.pack(fill="both", expand=True)
+                return
+            self.chart_empty_label.pack_forget()
+            self.chart_main_frame.pack(fill=tk.BOTH, expand=True)
+
+            first_draw = not self.chart_history
+            self.chart_date_var.set("")
+            first, last = (datetime.combine(d, datetime.min.time()) for d in full_range)
+            self.chart_zoom.set_range(first, last)
+            if first_draw:
+                fig.autofmt_xdate()
+                fig.tight_layout()
 
         except Exception as e:
             print(f"Error drawing chart: {e}")
-            label = tk.Label(self.chart_container, text=f"Error: {e}", bg="white", font=("Sarabun", 12), fg="red")
-            label.pack(fill="both", expand=True)
+            self.chart_empty_label.configure(text=f"Error: {e}", fg="red")
+            self.chart_empty_label.pack(fill="both", expand=True)
+
+    @staticmethod
+    def _chart_feedback_text(prog, prev_prog):
+        if prog == 0: return "วันนี้คุณยังไม่ได้ทำ 🔴"
+        elif prev_prog is not None and prog < prev_prog: return "วันนี้คุณทำได้น้อยลง ↓"
+        elif prev_prog is not None and prog > prev_prog: return "วันนี้คุณทำได้ดีขึ้น ↑"
+        elif prog < 50: return "วันนี้คุณทำได้น้อยลง ↓"
+        else: return "วันนี้คุณทำได้ตามปกติ ✓"
+
+    def _show_chart_day(self, idx):
+        history = self.chart_history
+        day = history[idx]
+        prev_prog = history[idx-1]['progress'] if idx > 0 else None
+        fb = self._chart_feedback_text(day['progress'], prev_prog)
+        date_str = day['date'].strftime('%d-%b-%Y')
+        self.chart_feedback_label.config(text=f"{date_str}\nProgress: {day['progress']:.0f}%\nSets: {day['sets_done']}\n{fb}")
+
+    def _update_chart_feedback(self, event=None):
+        selected_date_str = self.chart_date_var.get()
+        if not selected_date_str: return
+        try:
+            selected_date = datetime.strptime(selected_date_str, '%d-%b-%Y').date()
+            idx = next((i for i, h in enumerate(self.chart_history) if h['date'].date() == selected_date), None)
+            if idx is not None:
+                self._show_chart_day(idx)
+        except Exception as e: print(f"Error: {e}")
+
+    def _on_chart_click(self, event):
+        if event.inaxes != self.progress_plot.ax or self.chart_zoom.dragged: return
+        idx = self.progress_plot.point_at(event.xdata, event.ydata)
+        if idx is not None:
+            self._show_chart_day(idx)
+            self.chart_date_var.set(self.chart_history[idx]['date'].strftime('%d-%b-%Y'))
+
+    def play_sounds_sequential(self, filename, priority=PRIORITY_PROMPT, interrupt=False):
+        try:
+            self.audio.play(filename, priority, interrupt)
+        except Exception as e:
+            print(f"Sound error: {e}")
 
-    def play_sounds_sequential(self, filename):
-        def _play(f=filename):
+    def _open_profile_history(self, profile):
+        # History store, caught up with whatever reached the profile's text log without it
+        self.history_store = None
+        if profile.db_path:
             try:
-                if not f.endswith(".mp3"):
-                    f += ".mp3"
-                sound_path = f"Voices/{f}"
-                if os.path.exists(sound_path):
-                    sound = pygame.mixer.Sound(sound_path)
-                    sound.play()
+                self.history_store = HistoryStore(profile.db_path)
+                imported = self.history_store.import_text_log(profile.log_path)
+                if imported:
+                    print(f"[History] imported {imported} events from {profile.log_path}")
             except Exception as e:
-                print(f"Sound error: {e}")
-        threading.Thread(target=_play, daemon=True).start()
+                print(f"[History] store unavailable, using {profile.log_path}: {e}")
+                self.history_store = None
+        # Shared, memoized progress figures for the chart, dropdown and click feedback
+        self.analytics = ProgressAnalytics(profile.log_path, self.history_store)
+        # Log lines are written and fsynced off the Tk thread
+        listeners = [self.history_store.add_lines] if self.history_store is not None else []
+        log_path = profile.log_path if settings.LOG_MIRROR or self.history_store is None else None
+        self.log_writer = LogWriter(log_path, fsync=settings.LOG_FSYNC, fsync_interval=settings.LOG_FSYNC_INTERVAL,
+                                    listeners=listeners)
+
+    def _close_profile_history(self):
+        try:
+            self.log_writer.close()
+            print(f"[Log] {self.log_writer.stats()}")
+        except Exception as e:
+            print(f"[Log] close error: {e}")
+        if self.history_store is not None:
+            try:
+                self.history_store.close()
+            except Exception:
+                pass
 
-    def load_history(self):
+    def _save_profile_session(self):
         try:
-            with open("Anti-Finger.txt", "r", encoding="utf-8") as f:
-                lines = f.readlines()
-        except FileNotFoundError:
-            lines = ["No history found.\n"]
-        
-        # Limit lines to prevent lag
-        max_lines = 5000 
-        if len(lines) > max_lines:
-            lines = lines[-max_lines:]
+            self.profile.save_session(self.round, self.set, self.current_pose)
+        except Exception as e:
+            print(f"[Profile] save error: {e}")
+
+    def _profile_label(self, profile_id, name):
+        return f"{name} ({profile_id})"
+
+    def _refresh_profile_menu(self):
+        self.profile_labels = {self._profile_label(pid, name): pid for pid, name in self.profiles.names().items()}
+        self.profile_menu.configure(values=list(self.profile_labels))
+        self.profile_var.set(self._profile_label(self.profile.id, self.profile.name))
+
+    def _on_profile_selected(self, label):
+        profile_id = self.profile_labels.get(label)
+        if profile_id is not None:
+            self.switch_profile(profile_id)
+
+    def add_profile(self):
+        dialog = ctk.CTkInputDialog(text="ชื่อผู้ป่วย", title="เพิ่มผู้ป่วย")
+        name = dialog.get_input()
+        if not name or not name.strip():
+            return
+        try:
+            profile = self.profiles.create(name)
+        except Exception as e:
+            print(f"[Profile] create error: {e}")
+            return
+        self.switch_profile(profile.id)
+
+    def switch_profile(self, profile_id):
+        if profile_id == self.profile.id:
+            self._refresh_profile_menu()
+            return
+        # Stop the exercise so no line lands in the wrong patient's shard
+        self.running = False
+        self._cancel_countdown()
+        self.start_stop_button.configure(text="เริ่มต้น", fg_color=self.green_btn, hover_color=self.hover_green_bt)
+        self._save_profile_session()
+        self._close_profile_history()
+
+        self.profiles.set_active(profile_id)
+        self.profile = self.profiles.get(profile_id)
+        self._open_profile_history(self.profile)
+        self.round, self.set, self.current_pose = self.profile.round, self.profile.set, self.profile.current_pose
+        self._refresh_profile_menu()
+        self.timer_reset()
+        self.update_round()
+        self.update_text()
+        self.update_EX_pose()
+        if self.history_page.winfo_ismapped():
+            self.draw_progress_chart()
+            self.load_history()
 
-        self.history_textbox.configure(state="normal")
-        self.history_textbox.delete("1.0", "end")
-        self.history_textbox.insert("end", "".join(lines))
-        self.history_textbox.see("end")
-        self.history_textbox.configure(state="disabled")
+    def load_history(self):
+        fallback = []
+        if self.history_store is not None and not os.path.exists(self.profile.log_path):
+            try:
+                fallback = self.history_store.tail_lines(self.history_view.page_lines)
+            except Exception as e:
+                print(f"Error reading history: {e}")
+        try:
+            self.history_view.open(self.profile.log_path, fallback)
+        except Exception as e:
+            print(f"Error reading history: {e}")
 
     def show_main_page(self):
+        self.history_view.close()
         self.history_page.pack_forget()
         self.main_content_frame.pack(side="top", fill="both", expand=True, pady=int(20 * self.scale_h))
-        self.play_sounds_sequential("010.mp3")
+        self.play_sounds_sequential("010.mp3", PRIORITY_NAVIGATION)
 
     def show_history_page(self):
         self.main_content_frame.pack_forget()
-        self.play_sounds_sequential("009.mp3")
+        self.play_sounds_sequential("009.mp3", PRIORITY_NAVIGATION)
+        # The history readers below go to the file, so let queued lines land first
+        self.log_writer.flush(timeout=0.5)
         self.history_page.pack(side="top", fill="both", expand=True, pady=int(20 * self.scale_h))
         self.draw_progress_chart()
         self.load_history()
@@ -629,174 +674,146 @@ class AntiTriggerFingersApp(ctk.CTk):
     def write_log(self, message):
         now = datetime.now().strftime("[%Y-%m-%d %H:%M:%S]")
         log_message = f"{now} เซ็ตที่ {self.set} ครั้งที่ {self.round} : {message}"
-        try:
-            with open("Anti-Finger.txt", "a", encoding="utf-8") as f:
-                f.write(log_message + "\n")
-            print(log_message)
-        except Exception as e:
-            print(f"Error writing log: {e}")
+        if not self.log_writer.write(log_message):
+            print(f"[Log] queue full, not recorded: {log_message}")
+            self._show_log_warning()
 
-    def check_fingers(self):
-        try:
-            ret, frame = self.cap.read()
-            if not ret:
-                return
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            thresh = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)[1]
-            white_pixels = cv2.countNonZero(thresh)
-            if white_pixels > 50000:
-                if self.hand_posit < 5:
-                    self.hand_posit += 1
-        except Exception as e:
-            print(f"[check_fingers] Error: {e}")
+    def _show_log_warning(self):
+        # The writer is stuck; say so where the patient and staff will see it
+        self.app_title_label.configure(text="⚠ บันทึกประวัติไม่สำเร็จ", text_color=self.yellow_btn)
+        self.after(5000, lambda: self.app_title_label.configure(
+            text="AI-Powered Anti-trigger Fingers", text_color=self.white_fg))
 
     def _mediapipe_loop(self):
-        mp_hands = mp.solutions.hands
-        mp_drawing = mp.solutions.drawing_utils
-        drawing_spec_landmark = mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=4)
-        drawing_spec_connection = mp_drawing.DrawingSpec(color=(255, 0, 0), thickness=2, circle_radius=2)
-
-        hands = mp_hands.Hands(
-            static_image_mode=False, max_num_hands=1,
-            min_detection_confidence=0.5, min_tracking_confidence=0.5
-        )
-
-        pose_ranges = {
-            1: [(0, 200), (150, 185), (150, 185), (150, 185), (150, 185)],
-            2: [(0, 200), (40, 170), (40, 170), (40, 170), (40, 170)],
-            3: [(0, 200), (0, 60), (0, 60), (0, 60), (0, 60)],
-            4: [(0, 200), (0, 50), (0, 50), (0, 50), (0, 50)],
-            5: [(0, 200), (50, 185), (50, 185), (50, 160), (50, 160)],
-        }
-
-        def _angle_between(a, b):
-            ax, ay = a
-            bx, by = b
-            dot = ax * bx + ay * by
-            na = (ax * ax + ay * ay) ** 0.5
-            nb = (bx * bx + by * by) ** 0.5
-            if na == 0 or nb == 0:
-                return 0.0
-            cosv = max(-1.0, min(1.0, dot / (na * nb)))
-            return math.degrees(math.acos(cosv))
-
+        tracker = HandROITracker(padding=settings.ROI_PADDING) if settings.ROI_TRACKING else None
+        if settings.INFERENCE_WORKER:
+            detector = InferenceWorkerClient(roi_tracking=settings.ROI_TRACKING, roi_padding=settings.ROI_PADDING)
+        else:
+            detector = HandDetector(tracker=tracker)
+        cadence = None
+        if settings.ADAPTIVE_CADENCE:
+            cadence = InferenceCadence(stable_interval=settings.STABLE_INTERVAL)
+        self.inference_cadence = cadence
+
+        # Use dynamic dimensions
+        preview = PreviewRenderer(self.camera_width, self.camera_height)
+
+        # Pace to the configured rate, or to the source's own frame rate
+        pacer = FramePacer(settings.TARGET_FPS or self.cap.fps)
+        self.frame_pacer = pacer
+
+        # Smoothing, dropout bridging and range hysteresis between landmarks and classification
+        angle_filter = None
+        hysteresis = None
+        if settings.SMOOTHING:
+            angle_filter = AngleFilter(max_gap=settings.DROPOUT_BRIDGE)
+            hysteresis = MatchHysteresis(band=settings.HYSTERESIS_BAND)
+
+        last_seq = 0
+        hands = []
         try:
             while self.mp_running:
-                ret, frame = self.cap.read()
-                if not ret:
-                    time.sleep(0.01)
+                latest = self.capture.buffer.wait_newer(last_seq, timeout=0.1)
+                if latest is None:
+                    if self.capture.buffer.closed:
+                        break
                     continue
+                last_seq, frame_ts, frame = latest
+                frame_start = time.perf_counter()
+                pacer.frame(last_seq, frame_ts)
 
                 frame = cv2.flip(frame, 1)
                 h, w = frame.shape[:2]
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                results = hands.process(rgb)
+                # While a matched pose is held still, skipped frames reuse the last landmarks
+                inferred = cadence is None or cadence.should_infer()
+                if inferred:
+                    with tracer.span("hands_process", "detect"):
+                        try:
+                            results = detector.detect(frame)
+                        except (TimeoutError, EOFError, OSError) as e:
+                            print(f"[Inference Worker] {e}, falling back to in-process inference")
+                            detector.close()
+                            detector = HandDetector(tracker=tracker)
+                            results = detector.detect(frame)
+                    hands = results.multi_hand_landmarks or []
 
-                thumb_a = index_a = middle_a = ring_a = pinky_a = 0
                 pose_match = False
 
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        mp_drawing.draw_landmarks(
-                            frame, hand_landmarks, mp_hands.HAND_CONNECTIONS,
-                            drawing_spec_landmark, drawing_spec_connection
-                        )
-
-                        lm = hand_landmarks.landmark
-
-                        def to_pt(idx):
-                            return (lm[idx].x * w, lm[idx].y * h)
-
-                        wrist = to_pt(0)
-                        
-                        # Calculate angles
-                        v1 = (to_pt(4)[0] - to_pt(2)[0], to_pt(4)[1] - to_pt(2)[1])
-                        v2 = (wrist[0] - to_pt(2)[0], wrist[1] - to_pt(2)[1])
-                        thumb_a = _angle_between(v1, v2)
-
-                        v1 = (to_pt(8)[0] - to_pt(5)[0], to_pt(8)[1] - to_pt(5)[1])
-                        v2 = (wrist[0] - to_pt(5)[0], wrist[1] - to_pt(5)[1])
-                        index_a = _angle_between(v1, v2)
-
-                        v1 = (to_pt(12)[0] - to_pt(9)[0], to_pt(12)[1] - to_pt(9)[1])
-                        v2 = (wrist[0] - to_pt(9)[0], wrist[1] - to_pt(9)[1])
-                        middle_a = _angle_between(v1, v2)
-
-                        v1 = (to_pt(16)[0] - to_pt(13)[0], to_pt(16)[1] - to_pt(13)[1])
-                        v2 = (wrist[0] - to_pt(13)[0], wrist[1] - to_pt(13)[1])
-                        ring_a = _angle_between(v1, v2)
-
-                        v1 = (to_pt(20)[0] - to_pt(17)[0], to_pt(20)[1] - to_pt(17)[1])
-                        v2 = (wrist[0] - to_pt(17)[0], wrist[1] - to_pt(17)[1])
-                        pinky_a = _angle_between(v1, v2)
-
-                        reqs = pose_ranges.get(self.current_pose, pose_ranges[1])
-                        angles = [thumb_a, index_a, middle_a, ring_a, pinky_a]
-                        
-                        ok = True
-                        for ang, (mn, mx) in zip(angles, reqs):
-                            if ang is None or not (mn <= ang <= mx):
-                                ok = False
-                                break
-                        pose_match = ok
+                angles = None
+                for hand_landmarks in hands:
+                    detector.draw(frame, hand_landmarks)
 
-                        try:
-                            cv2.putText(frame, f"Match:{'YES' if pose_match else 'NO'}", (10, 180),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 200, 0) if pose_match else (0, 0, 200), 2)
-                        except Exception:
-                            pass
-
-                display_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                pil_img = Image.fromarray(display_rgb)
-
-                def _crop_and_resize(img, target_w, target_h):
-                    src_w, src_h = img.size
-                    target_ratio = target_w / target_h
-                    src_ratio = src_w / src_h
-                    if src_ratio > target_ratio:
-                        new_w = int(src_h * target_ratio)
-                        left = (src_w - new_w) // 2
-                        img = img.crop((left, 0, left + new_w, src_h))
+                    # Angles for all five fingers (and every joint, if a pose uses them) in one batched operation
+                    angles = hand_angles(hand_landmarks, w, h, self.poses.uses_joints)
+                if angle_filter is not None:
+                    angles = angle_filter.update(angles, frame_ts)
+
+                if angles is not None:
+                    # Score every pose at once; the closest one is shown when the current pose misses
+                    margins = self.poses.margins(angles)
+                    if hysteresis is not None:
+                        pose_match = hysteresis.update(self.poses, margins, self.current_pose)
+                    else:
+                        pose_match = self.poses.matches(margins, self.current_pose)
+                    draw_match(frame, pose_match, self.poses.closest(margins))
+                elif hysteresis is not None:
+                    hysteresis.reset()
+
+                # Hold accounting on frame timestamps; the UI only hears about state changes
+                hold_event = self.hold_timer.update(pose_match and self.running and not self.still_hold, frame_ts)
+
+                if cadence is not None:
+                    if hands:
+                        wrist = hands[0].landmark[0]
+                        cadence.observe(inferred, angles, (wrist.x, wrist.y), pose_match)
                     else:
-                        new_h = int(src_w / target_ratio)
-                        top = (src_h - new_h) // 2
-                        img = img.crop((0, top, src_w, top + new_h))
-                    return img.resize((target_w, target_h), Image.LANCZOS)
+                        cadence.observe(inferred, None, None, False)
+                    tracer.counter("cadence", inferred=cadence.inferred, reused=cadence.reused)
 
-                # Use dynamic dimensions
-                pil_img = _crop_and_resize(pil_img, self.camera_width, self.camera_height)
+                with tracer.span("preview", "detect"):
+                    pil_img = preview.render(frame)
+                tracer.complete("detect_frame", frame_start, "detect", seq=last_seq, match=pose_match)
 
                 try:
-                    self.after(0, lambda im=pil_img, a=(thumb_a, index_a, middle_a, ring_a, pinky_a), m=pose_match: (
-                        self._update_camera_label(im),
-                        self._apply_pose_detection(a, m)
-                    ))
+                    if hold_event is not None:
+                        self.after(0, self._on_hold_event, *hold_event)
+                    self.after(0, self._update_camera_label, pil_img)
                 except RuntimeError:
                     break
-                time.sleep(0.02)
+                pacer.wait()
+                tracer.counter("pacing", late=pacer.late, dropped=pacer.dropped, skipped=pacer.skipped)
         finally:
-            hands.close()
+            detector.close()
 
-    def _apply_pose_detection(self, angles, match):
-        try:
-            if match:
-                if self.hand_posit < 5:
-                    self.hand_posit += 1
-            else:
-                self.hand_posit = 0
-        except Exception as e:
-            print(f"[Pose Apply] {e}")
+    @tracer.traced()
+    def _on_hold_event(self, kind, secs, generation):
+        # Drop events for a hold that was reset after they were queued
+        if generation != self.hold_timer.generation:
+            return
+        self.time_current = secs
+        if kind == "hold":
+            self.update_timer()
+        elif kind == "pause":
+            self._stop_timer_animation()
+        elif kind == "complete":
+            self._stop_timer_animation()
+            self._on_pose_success()
 
+    @tracer.traced()
     def _update_camera_label(self, pil_image):
         try:
-            self.camera_photo = ImageTk.PhotoImage(pil_image)
-            self.camera_label.configure(image=self.camera_photo)
+            # Update the existing Tk photo in place instead of allocating a new one per frame
+            if (self.camera_photo.width(), self.camera_photo.height()) == pil_image.size:
+                self.camera_photo.paste(pil_image)
+            else:
+                self.camera_photo = ImageTk.PhotoImage(pil_image)
+                self.camera_label.configure(image=self.camera_photo)
         except Exception as e:
             pass
 
     def timer_reset(self):
+        self.hold_timer.reset()
         self.time_current = self.time_max
-        self.hand_posit = 0
         self.update_timer()
         self.reset_pic()
         try:
@@ -808,77 +825,30 @@ class AntiTriggerFingersApp(ctk.CTk):
         return
 
     def reset_pic(self):
-        self.timer_canvas.delete("progress")
-        l = self.timer_pad
-        r = self.timer_canvas_size - self.timer_pad
-        self.timer_canvas.create_oval(l, l, r, r, outline="#3CB371", width=10, tags="progress")
+        self.timer_ring.show_full(self.timer_hold_color)
 
     def update_timer(self):
+        """Follow the hold progress on the timer ring until the hold pauses or completes"""
         try:
-            prev_time = self.time_current + 1
-            from_prog = max(0.0, min(1.0, (self.time_max - prev_time) / float(self.time_max)))
-            to_prog = max(0.0, min(1.0, (self.time_max - self.time_current) / float(self.time_max)))
-
             self._stop_timer_animation()
-
-            self._timer_prev_sec = prev_time
-            self._timer_anim_from = from_prog
-            self._timer_anim_to = to_prog
-            self._timer_anim_start = time.time()
-            self._timer_anim_duration = 1.0
-            self.timer_anim_job = self.after(0, self._animate_timer)
+            self.animation_clock.add("timer", self._animate_timer)
         except Exception as e:
             print(f"[update_timer] {e}")
 
-    def _animate_timer(self):
-        try:
-            now = time.time()
-            elapsed = now - self._timer_anim_start
-            t = min(1.0, max(0.0, elapsed / float(self._timer_anim_duration)))
-            progress = self._timer_anim_from + (self._timer_anim_to - self._timer_anim_from) * t
-            extent = 360 * progress
-
-            self.timer_canvas.delete("progress")
-            l = self.timer_pad
-            r = self.timer_canvas_size - self.timer_pad
-            self.timer_canvas.create_arc(l, l, r, r, start=-90, extent=-extent, style="arc", width=10, outline="#3CB371", tags="progress")
-
-            try:
-                prev = getattr(self, "_timer_prev_sec", self.time_current + 1)
-                interp = prev + (self.time_current - prev) * t
-                interp = max(float(self.time_current), min(float(prev), interp))
-                secs = int(math.ceil(interp))
-            except Exception:
-                secs = int(max(0, self.time_current))
-            self.timer_canvas.itemconfig(self.timer_text, text=str(secs))
-
-            if t < 1.0:
-                self.timer_anim_job = self.after(50, self._animate_timer)
-            else:
-                self.timer_anim_job = None
-                self.timer_canvas.delete("progress")
-                l = self.timer_pad
-                r = self.timer_canvas_size - self.timer_pad
-                self.timer_canvas.create_arc(l, l, r, r, start=-90, extent=-360 * self._timer_anim_to, style="arc", width=10, outline="#3CB371", tags="progress")
-                self.timer_canvas.itemconfig(self.timer_text, text=str(self.time_current))
-        except Exception as e:
-            self.timer_anim_job = None
+    @tracer.traced()
+    def _animate_timer(self, now):
+        progress = self.hold_timer.progress(now)
+        self.timer_ring.show_arc(360 * progress, self.timer_hold_color)
+        secs = int(math.ceil(self.time_max * (1.0 - progress)))
+        self.timer_ring.set_text(secs)
+        return self.hold_timer.holding
 
     def _stop_timer_animation(self):
         try:
-            if self.timer_anim_job:
-                try:
-                    self.after_cancel(self.timer_anim_job)
-                except Exception:
-                    pass
-                self.timer_anim_job = None
-            progress = (self.time_max - self.time_current) / float(self.time_max) if self.time_max else 0.0
-            extent = 360 * progress
-            self.timer_canvas.delete("progress")
-            l = self.timer_pad
-            r = self.timer_canvas_size - self.timer_pad
-            self.timer_canvas.create_arc(l, l, r, r, start=-90, extent=-extent, style="arc", width=10, outline="#3CB371", tags="progress")
-            self.timer_canvas.itemconfig(self.timer_text, text=str(self.time_current))
+            self.animation_clock.remove("timer")
+            progress = self.hold_timer.progress(time.perf_counter())
+            self.timer_ring.show_arc(360 * progress, self.timer_hold_color)
+            self.timer_ring.set_text(self.time_current)
         except Exception as e:
             pass
 
@@ -893,7 +863,7 @@ class AntiTriggerFingersApp(ctk.CTk):
     def update_EX_pose(self):
         try:
             img_size = int(300 * self.u_scale)
-            small_hand_image_pil = Image.open(f"pictures/EX_POSE/pose{self.current_pose}.png")
+            small_hand_image_pil = Image.open(self.poses.images[self.current_pose - 1])
             small_hand_image_pil = small_hand_image_pil.resize((img_size, img_size))
             self.small_hand_photo = ImageTk.PhotoImage(small_hand_image_pil)
             self.small_hand_label.configure(image=self.small_hand_photo)
@@ -904,77 +874,50 @@ class AntiTriggerFingersApp(ctk.CTk):
         if self.start_stop_button.cget("text") == "เริ่มต้น":
             self.start_stop_button.configure(text="หยุด", fg_color=self.yellow_btn, hover_color=self.hover_yellow_bt)
             self.start_pose_countdown(2)
-            self.play_sounds_sequential("006.mp3")
+            self.play_sounds_sequential("006.mp3", PRIORITY_CONTROL, interrupt=True)
             if self.current_pose == 1:
                 try:
-                    self.after(1500, lambda: self.play_sounds_sequential(self.pose_sounds[self.current_pose][0]))
+                    # Queued behind 006, so it starts when that prompt ends
+                    self.play_sounds_sequential(self.pose_sounds[self.current_pose][0])
                 except Exception:
                     pass
         else:
             self.start_stop_button.configure(text="เริ่มต้น", fg_color=self.green_btn, hover_color=self.hover_green_bt)
             self.running = False
             self._cancel_countdown()
-            self.play_sounds_sequential("007.mp3")
+            self.play_sounds_sequential("007.mp3", PRIORITY_CONTROL, interrupt=True)
 
     def start_pose_countdown(self, seconds: int):
         self._cancel_countdown()
         self.countdown_active = True
         self.countdown_total = max(1, seconds)
-        self.countdown_end_time = time.time() + self.countdown_total
-        self.countdown_job = self.after(0, self._animate_countdown)
+        self.countdown_end_time = time.perf_counter() + self.countdown_total
+        self.animation_clock.add("countdown", self._animate_countdown)
 
-    def _animate_countdown(self):
+    @tracer.traced()
+    def _animate_countdown(self, now):
         if not self.countdown_active:
-            return
-        now = time.time()
+            return False
         remaining = self.countdown_end_time - now
         if remaining <= 0:
             self.countdown_active = False
-            self.countdown_job = None
             self.running = True
-            try:
-                self.timer_canvas.itemconfig(self.timer_text, text=str(self.time_current))
-                self.timer_canvas.delete("progress")
-                l = self.timer_pad
-                r = self.timer_canvas_size - self.timer_pad
-                self.timer_canvas.create_oval(l, l, r, r, outline="#3CB371", width=10, tags="progress")
-            except Exception:
-                pass
+            self.timer_ring.set_text(self.time_current)
+            self.timer_ring.show_full(self.timer_hold_color)
+            return False
 
         frac = max(0.0, min(1.0, remaining / float(self.countdown_total)))
-        extent = 360 * frac
-
-        try:
-            self.timer_canvas.delete("progress")
-            l = self.timer_pad
-            r = self.timer_canvas_size - self.timer_pad
-            self.timer_canvas.create_arc(l, l, r, r, start=-90, extent=-extent, style="arc", width=10, outline="#FFA500", tags="progress")
-            secs = int(math.ceil(remaining))
-            self.timer_canvas.itemconfig(self.timer_text, text=str(secs))
-        except Exception:
-            pass
-
-        try:
-            self.countdown_job = self.after(50, self._animate_countdown)
-        except Exception:
-            self.countdown_active = False
-            self.countdown_job = None
+        self.timer_ring.show_arc(360 * frac, self.timer_countdown_color)
+        self.timer_ring.set_text(int(math.ceil(remaining)))
+        return True
 
     def _cancel_countdown(self):
         if self.countdown_active:
             self.countdown_active = False
-            if self.countdown_job:
-                try:
-                    self.after_cancel(self.countdown_job)
-                except Exception:
-                    pass
-                self.countdown_job = None
+            self.animation_clock.remove("countdown")
             try:
-                self.timer_canvas.itemconfig(self.timer_text, text=str(self.time_current))
-                self.timer_canvas.delete("progress")
-                l = self.timer_pad
-                r = self.timer_canvas_size - self.timer_pad
-                self.timer_canvas.create_oval(l, l, r, r, outline="#3CB371", width=10, tags="progress")
+                self.timer_ring.set_text(self.time_current)
+                self.timer_ring.show_full(self.timer_hold_color)
             except Exception:
                 pass
 
@@ -992,9 +935,10 @@ class AntiTriggerFingersApp(ctk.CTk):
         self.timer_reset()
         self.update_text()
         self.update_round()
+        self._save_profile_session()
 
         try:
-            self.play_sounds_sequential("008.mp3")
+            self.play_sounds_sequential("008.mp3", PRIORITY_CONTROL, interrupt=True)
         except Exception as e:
             print(f"[reset_action] play sound error: {e}")
 
@@ -1006,40 +950,33 @@ class AntiTriggerFingersApp(ctk.CTk):
                 self.mp_thread.join(timeout=1.0)
         except Exception:
             pass
+        try:
+            self.capture.stop()
+        except Exception:
+            pass
         try:
             if self.cap is not None and self.cap.isOpened():
                 self.cap.release()
         except Exception:
             pass
+        if hasattr(self, "frame_pacer"):
+            print(f"[Pacing] {self.frame_pacer.stats()}")
+        if hasattr(self, "capture"):
+            print(f"[Capture] {self.capture.frames_captured} frames, {self.capture.buffer.dropped} never read")
+        try:
+            self.audio.close()
+        except Exception:
+            pass
+        self._save_profile_session()
+        self._close_profile_history()
+        try:
+            tracer.save()
+        except Exception as e:
+            print(f"[Trace] save error: {e}")
         self.destroy()
         os._exit(0)
         
-    def check_sensor_loop(self):
-        if self.running:
-            try:
-                self.check_fingers()
-            except Exception as e:
-                pass
-
-            if self.hand_posit == 5 and self.time_current > 0 and not self.still_hold:
-                try:
-                    self.time_current -= 1
-                    self.update_timer()
-                except Exception as e:
-                    pass
-
-                if self.time_current <= 0:
-                    try:
-                        delay_ms = int(getattr(self, "_timer_anim_duration", 1.0) * 1000) + 50
-                        self.after(delay_ms, self._on_pose_success)
-                    except Exception as e:
-                        pass
-
-        try:
-            self.after(1000, self.check_sensor_loop)
-        except Exception as e:
-            pass
-
+    @tracer.traced()
     def _on_pose_success(self):
         try:
             if self.time_current > 0:
@@ -1049,7 +986,7 @@ class AntiTriggerFingersApp(ctk.CTk):
             print(f"[_on_pose_success] write_log error: {e}")
 
         self.current_pose += 1
-        if self.current_pose > 5:
+        if self.current_pose > len(self.poses):
             self.current_pose = 1
             self.round += 1
             if self.round >= 10:
@@ -1071,5 +1008,6 @@ class AntiTriggerFingersApp(ctk.CTk):
             pass
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = AntiTriggerFingersApp()
     app.mainloop()
\ No newline at end of file
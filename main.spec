@@ -1,7 +1,7 @@
 # -*- mode: python ; coding: utf-8 -*-
 from PyInstaller.utils.hooks import collect_all
 
-datas = [('pictures', 'pictures')]
+datas = [('pictures', 'pictures'), ('poses.json', '.')]
 binaries = []
 hiddenimports = []
 tmp_ret = collect_all('mediapipe')
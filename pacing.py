@@ -0,0 +1,62 @@
+import time
+
+
+class FramePacer:
+    """Paces the capture/inference loop to a target frame rate.
+
+    Each slot starts at the capture timestamp of the frame being processed.
+    wait() sleeps only for what is left of the slot after the work already done,
+    so the loop rate no longer depends on how long inference took. Anchoring on
+    capture time rather than wake-up time keeps sleep overshoot from accumulating.
+    When the target equals the camera rate, the slot ends as the next frame arrives.
+
+    Counters:
+      late     iterations whose work overran the slot
+      dropped  captured frames lost because the previous iteration was late
+      skipped  all captured frames the loop never processed, including frames
+               skipped on purpose when the target is below the camera rate
+    """
+
+    def __init__(self, fps):
+        self.interval = 1.0 / fps if fps and fps > 0 else 1.0 / 30.0
+        self._slot_start = None
+        self._last_seq = None
+        self._was_late = False
+        self.frames = 0
+        self.late = 0
+        self.dropped = 0
+        self.skipped = 0
+        self.max_overrun = 0.0
+
+    def frame(self, seq, timestamp):
+        """Start a slot for capture frame seq, captured at perf_counter() time timestamp"""
+        self._slot_start = timestamp
+        if self._last_seq is not None and seq > self._last_seq + 1:
+            gap = seq - self._last_seq - 1
+            self.skipped += gap
+            if self._was_late:
+                self.dropped += gap
+        self._last_seq = seq
+        self.frames += 1
+
+    def wait(self):
+        """Sleep for the rest of the current slot"""
+        if self._slot_start is None:
+            return
+        remaining = self._slot_start + self.interval - time.perf_counter()
+        self._was_late = remaining < 0
+        if self._was_late:
+            self.late += 1
+            self.max_overrun = max(self.max_overrun, -remaining)
+        else:
+            time.sleep(remaining)
+
+    def stats(self):
+        return {
+            "target_fps": 1.0 / self.interval,
+            "frames": self.frames,
+            "late": self.late,
+            "dropped": self.dropped,
+            "skipped": self.skipped,
+            "max_overrun_ms": self.max_overrun * 1000.0,
+        }
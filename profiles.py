@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+
+DEFAULT_PROFILE = "default"
+REGISTRY_FILE = "profiles.json"
+SESSION_FILE = "session.json"
+LOG_NAME = "Anti-Finger.txt"
+DB_NAME = "history.db"
+
+
+def _write_json(path, data):
+    # Write then rename so a crash never leaves a half-written file behind
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _read_json(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+class Profile:
+    """One patient: display name, history shard paths and session counters."""
+
+    def __init__(self, profile_id, name, directory, log_path, db_path):
+        self.id = profile_id
+        self.name = name
+        self.directory = directory
+        self.log_path = log_path
+        self.db_path = db_path
+        self.round = 0
+        self.set = 0
+        self.current_pose = 1
+
+    @property
+    def session_path(self):
+        return os.path.join(self.directory, SESSION_FILE)
+
+    def load_session(self):
+        data = _read_json(self.session_path, {})
+        self.round = int(data.get("round", 0))
+        self.set = int(data.get("set", 0))
+        self.current_pose = int(data.get("current_pose", 1))
+
+    def save_session(self, round_no, set_no, current_pose):
+        self.round, self.set, self.current_pose = round_no, set_no, current_pose
+        os.makedirs(self.directory, exist_ok=True)
+        _write_json(self.session_path, {"round": round_no, "set": set_no, "current_pose": current_pose})
+
+
+class ProfileRegistry:
+    """Patient profiles under one directory, each with its own history shard.
+
+    profiles.json only holds ids, names and the active id. Every profile keeps
+    its text log, history database and session counters in <root>/<id>/, so
+    switching patients opens one shard no matter how many profiles exist. The
+    default profile keeps the legacy log and database paths so history written
+    before profiles existed stays where it is.
+    """
+
+    def __init__(self, root="profiles", default_log=LOG_NAME, default_db=DB_NAME):
+        self.root = root
+        self.default_log = default_log
+        self.default_db = default_db
+        # An empty default database means history lives in text logs only, for every profile
+        self.use_db = bool(default_db)
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        data = _read_json(self.registry_path, {})
+        self._names = {DEFAULT_PROFILE: "ผู้ใช้ทั่วไป"}
+        self._names.update(data.get("profiles", {}))
+        self._next_id = int(data.get("next_id", 1))
+        self.active_id = data.get("active", DEFAULT_PROFILE)
+        if self.active_id not in self._names:
+            self.active_id = DEFAULT_PROFILE
+
+    @property
+    def registry_path(self):
+        return os.path.join(self.root, REGISTRY_FILE)
+
+    def ids(self):
+        return list(self._names)
+
+    def names(self):
+        return dict(self._names)
+
+    def get(self, profile_id):
+        name = self._names[profile_id]
+        directory = os.path.join(self.root, profile_id)
+        if profile_id == DEFAULT_PROFILE:
+            log_path, db_path = self.default_log, self.default_db
+        else:
+            log_path = os.path.join(directory, LOG_NAME)
+            db_path = os.path.join(directory, DB_NAME)
+        profile = Profile(profile_id, name, directory, log_path, db_path if self.use_db else "")
+        profile.load_session()
+        return profile
+
+    def active(self):
+        return self.get(self.active_id)
+
+    def create(self, name):
+        name = name.strip()
+        if not name:
+            raise ValueError("profile name is empty")
+        with self._lock:
+            profile_id = f"p{self._next_id:04d}"
+            self._next_id += 1
+            self._names[profile_id] = name
+            os.makedirs(os.path.join(self.root, profile_id), exist_ok=True)
+            self._save()
+        return self.get(profile_id)
+
+    def set_active(self, profile_id):
+        if profile_id not in self._names:
+            raise KeyError(profile_id)
+        with self._lock:
+            self.active_id = profile_id
+            self._save()
+
+    def _save(self):
+        profiles = {k: v for k, v in self._names.items() if k != DEFAULT_PROFILE}
+        _write_json(self.registry_path, {"active": self.active_id, "next_id": self._next_id, "profiles": profiles})
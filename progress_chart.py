@@ -0,0 +1,175 @@
+from datetime import timedelta
+import numpy as np
+import matplotlib.dates as mdates
+from matplotlib.collections import LineCollection
+from history_series import bucket_days
+
+RED = (1, 0, 0)
+GREEN = (0, 1, 0)
+ORANGE = (1, 0.65, 0)
+DATE_FORMATS = {"day": "%d-%b", "week": "%d-%b-%y", "month": "%b-%Y"}
+
+
+def candle_colors(progress):
+    """Per-day colours: green when up on the day before, orange when down, else red/green by the 50% line."""
+    progress = np.asarray(progress, dtype=float)
+    prev = np.concatenate([[np.nan], progress[:-1]])
+    colors = np.where((progress < 50)[:, None], RED, GREEN).astype(float)
+    colors[progress > prev] = GREEN
+    colors[progress < prev] = ORANGE
+    return colors
+
+
+class ProgressPlot:
+    """Candle-style daily progress chart whose artists are created once.
+
+    Wicks and bodies are one LineCollection each, the closing markers one Line2D
+    and the up/down arrows one Line2D per direction. set_history() only replaces
+    their data, so a refresh costs the same number of artists however many days
+    are shown.
+    """
+
+    def __init__(self, ax, font_prop=None, title_font_prop=None):
+        self.ax = ax
+        self.wicks = LineCollection([], linewidths=2)
+        self.bodies = LineCollection([], linewidths=8)
+        ax.add_collection(self.wicks)
+        ax.add_collection(self.bodies)
+        self.closes, = ax.plot([], [], "o", color="black", markersize=8)
+        self.ups, = ax.plot([], [], linestyle="none", marker=r"$\uparrow$", color="green", markersize=12)
+        self.downs, = ax.plot([], [], linestyle="none", marker=r"$\downarrow$", color="black", markersize=12)
+
+        ax.xaxis_date()
+        ax.xaxis.set_major_formatter(mdates.DateFormatter("%d-%b"))
+        ax.set_ylabel("ความสำเร็จ (%)", fontproperties=font_prop)
+        ax.set_title("สถิติของคุณ", fontproperties=title_font_prop)
+        ax.set_ylim(0, 110)
+        ax.grid(True, linestyle="--", alpha=0.5)
+
+        self.x = np.array([])
+        self.progress = np.array([])
+        self.level = "day"
+
+    def set_history(self, history, xlim=None, level="day"):
+        """Replace the plotted buckets with history (dicts with 'date' and 'progress').
+
+        xlim is a (start, end) pair of datetimes; by default the axis fits the data.
+        """
+        x = mdates.date2num([h["date"] for h in history]) if history else np.array([])
+        close = np.array([h["progress"] for h in history], dtype=float)
+        # Each candle opens at the previous day's close
+        open_ = np.concatenate([close[:1], close[:-1]])
+        low = np.minimum(open_, close)
+        high = np.maximum(open_, close)
+        colors = candle_colors(close)
+
+        self.wicks.set_segments(np.stack([np.column_stack([x, low]), np.column_stack([x, high])], axis=1))
+        self.bodies.set_segments(np.stack([np.column_stack([x, open_]), np.column_stack([x, close])], axis=1))
+        self.wicks.set_color(colors)
+        self.bodies.set_color(colors)
+        self.closes.set_data(x, close)
+        up = np.zeros(len(close), dtype=bool)
+        down = np.zeros(len(close), dtype=bool)
+        up[1:] = close[1:] > close[:-1]
+        down[1:] = close[1:] < close[:-1]
+        self.ups.set_data(x[up], close[up] + 8)
+        self.downs.set_data(x[down], close[down] + 8)
+
+        if level != self.level:
+            self.ax.xaxis.set_major_formatter(mdates.DateFormatter(DATE_FORMATS[level]))
+            self.level = level
+        # Thinner bodies when many buckets share the axis
+        self.bodies.set_linewidth(max(2.0, min(8.0, 480.0 / max(len(x), 1))))
+        if xlim is not None:
+            self.ax.set_xlim(mdates.date2num(xlim[0]), mdates.date2num(xlim[1]))
+        elif len(x):
+            pad = 0.6 * bucket_days(level) if len(x) > 1 else bucket_days(level)
+            self.ax.set_xlim(x[0] - pad, x[-1] + pad)
+        self.x = x
+        self.progress = close
+
+    def point_at(self, xdata, ydata, dx=None, dy=5):
+        """Index of the bucket whose closing marker is near (xdata, ydata), or None."""
+        if xdata is None or ydata is None or not len(self.x):
+            return None
+        if dx is None:
+            # Same on-screen tolerance whatever the zoom
+            lo, hi = self.ax.get_xlim()
+            dx = max(0.3 * bucket_days(self.level), (hi - lo) / 150.0)
+        near = np.flatnonzero((np.abs(self.x - xdata) < dx) & (np.abs(self.progress - ydata) < dy))
+        return int(near[0]) if len(near) else None
+
+
+class TimelineZoom:
+    """Mouse-wheel zoom and drag pan along the chart's date axis.
+
+    Every change of the visible window calls query(start, end) for just that
+    window; it returns (history, level) and the plot is redrawn with it.
+    """
+
+    def __init__(self, canvas, plot, query, min_days=7, zoom_step=1.25, drag_pixels=5):
+        self.canvas = canvas
+        self.plot = plot
+        self.query = query
+        self.min_days = min_days
+        self.zoom_step = zoom_step
+        self.drag_pixels = drag_pixels
+        self.first = None
+        self.last = None
+        self.start = None
+        self.end = None
+        self.history = []
+        self.dragged = False
+        self._press = None
+        canvas.mpl_connect("scroll_event", self._on_scroll)
+        canvas.mpl_connect("button_press_event", self._on_press)
+        canvas.mpl_connect("motion_notify_event", self._on_motion)
+        canvas.mpl_connect("button_release_event", self._on_release)
+
+    def set_range(self, first, last):
+        """Set the span of the data (datetimes) and show all of it."""
+        self.first = first
+        self.last = last
+        self.show(first, last)
+
+    def show(self, start, end):
+        if self.first is None:
+            return
+        span = max(end - start, timedelta(days=self.min_days))
+        full = (self.last - self.first) + timedelta(days=1)
+        span = min(span, max(full, timedelta(days=self.min_days)))
+        # Keep the window inside the data, with a day of margin on each side
+        start = max(start, self.first - timedelta(days=1))
+        start = min(start, self.last + timedelta(days=1) - span)
+        end = start + span
+        self.start, self.end = start, end
+        self.history, level = self.query(start.date(), end.date())
+        pad = timedelta(days=0.6 * bucket_days(level))
+        self.plot.set_history(self.history, xlim=(start - pad, end + pad), level=level)
+        self.canvas.draw_idle()
+
+    def _on_scroll(self, event):
+        if event.inaxes != self.plot.ax or event.xdata is None or self.start is None:
+            return
+        center = mdates.num2date(event.xdata).replace(tzinfo=None)
+        factor = 1.0 / self.zoom_step if event.button == "up" else self.zoom_step
+        self.show(center - (center - self.start) * factor, center + (self.end - center) * factor)
+
+    def _on_press(self, event):
+        self.dragged = False
+        if event.button == 1 and event.inaxes == self.plot.ax and self.start is not None:
+            self._press = (event.x, self.start, self.end, self.plot.ax.get_xlim())
+
+    def _on_motion(self, event):
+        if self._press is None or event.x is None:
+            return
+        x0, start, end, (lo, hi) = self._press
+        if not self.dragged and abs(event.x - x0) < self.drag_pixels:
+            return
+        self.dragged = True
+        width = self.plot.ax.bbox.width or 1.0
+        shift = timedelta(days=(x0 - event.x) * (hi - lo) / width)
+        self.show(start + shift, end + shift)
+
+    def _on_release(self, event):
+        self._press = None
@@ -0,0 +1,70 @@
+class HandROITracker:
+    """Tracks a square region around the hand so inference can run on a crop.
+
+    The region comes from the previous frame's landmarks, padded on every side.
+    It is kept while the hand stays well inside it, so MediaPipe sees a stable crop
+    while the patient holds a pose, and dropped as soon as the hand is lost.
+    """
+
+    def __init__(self, padding=0.35, min_size=160, max_fraction=0.8, margin=0.1):
+        self.padding = padding
+        self.min_size = min_size
+        self.max_fraction = max_fraction
+        self.margin = margin
+        self.roi = None
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.losses = 0
+
+    def region(self):
+        """(x0, y0, x1, y1) to run inference on, or None for a full-frame search"""
+        if self.roi is None:
+            self.full_frames += 1
+        else:
+            self.roi_frames += 1
+        return self.roi
+
+    def lost(self):
+        if self.roi is not None:
+            self.losses += 1
+        self.roi = None
+
+    def to_frame(self, hand_landmarks, roi, w, h):
+        """Remap landmarks normalised to the crop back to full-frame normalised coordinates"""
+        x0, y0, x1, y1 = roi
+        cw = x1 - x0
+        ch = y1 - y0
+        for p in hand_landmarks.landmark:
+            p.x = (p.x * cw + x0) / w
+            p.y = (p.y * ch + y0) / h
+            p.z = p.z * cw / w
+
+    def update(self, hand_landmarks, w, h):
+        xs = [p.x for p in hand_landmarks.landmark]
+        ys = [p.y for p in hand_landmarks.landmark]
+        bx0, bx1 = min(xs) * w, max(xs) * w
+        by0, by1 = min(ys) * h, max(ys) * h
+
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            m = (x1 - x0) * self.margin
+            needed = max(bx1 - bx0, by1 - by0) * (1 + 2 * self.padding)
+            inside = bx0 >= x0 + m and bx1 <= x1 - m and by0 >= y0 + m and by1 <= y1 - m
+            if inside and (x1 - x0) <= 2 * max(needed, self.min_size):
+                return
+
+        size = max(bx1 - bx0, by1 - by0) * (1 + 2 * self.padding)
+        size = max(size, self.min_size)
+        if size >= self.max_fraction * min(w, h):
+            # The hand fills most of the frame, a crop would save nothing
+            self.roi = None
+            return
+        size = int(size)
+        cx = (bx0 + bx1) / 2
+        cy = (by0 + by1) / 2
+        x0 = int(min(max(cx - size / 2, 0), w - size))
+        y0 = int(min(max(cy - size / 2, 0), h - size))
+        self.roi = (x0, y0, x0 + size, y0 + size)
+
+    def stats(self):
+        return {"roi_frames": self.roi_frames, "full_frames": self.full_frames, "losses": self.losses}
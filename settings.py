@@ -0,0 +1,64 @@
+import os
+
+# --- Frame Source ---
+# Camera index ("0"), a video file path or a directory of frames
+FRAME_SOURCE = os.environ.get("ANTI_FINGER_SOURCE", "0")
+# "realtime" replays recordings at their recorded fps, "fast" as fast as possible
+REPLAY_REALTIME = os.environ.get("ANTI_FINGER_REPLAY", "realtime").lower() != "fast"
+REPLAY_LOOP = os.environ.get("ANTI_FINGER_REPLAY_LOOP", "0") == "1"
+# Frame rate used to replay a directory of frames (video files carry their own)
+REPLAY_FPS = float(os.environ.get("ANTI_FINGER_REPLAY_FPS", "30"))
+
+# --- Poses ---
+# Exercise definitions, JSON or TOML
+POSE_FILE = os.environ.get("ANTI_FINGER_POSES", "poses.json")
+
+# --- Angle Smoothing ---
+# One-Euro smoothing, dropout bridging and range hysteresis before classification
+SMOOTHING = os.environ.get("ANTI_FINGER_SMOOTHING", "1") == "1"
+# Longest detection dropout (seconds) bridged by prediction
+DROPOUT_BRIDGE = float(os.environ.get("ANTI_FINGER_DROPOUT_BRIDGE", "0.3"))
+# Degrees a finger may drift outside the range before a matched pose is lost
+HYSTERESIS_BAND = float(os.environ.get("ANTI_FINGER_HYSTERESIS", "5"))
+
+# --- Frame Pacing ---
+# Target rate of the detection loop; 0 follows the frame source's own fps
+TARGET_FPS = float(os.environ.get("ANTI_FINGER_TARGET_FPS", "0"))
+
+# --- Hand ROI Tracking ---
+# Run inference on a padded crop around the previous frame's hand
+ROI_TRACKING = os.environ.get("ANTI_FINGER_ROI", "0") == "1"
+# Padding on each side, as a fraction of the hand's bounding box
+ROI_PADDING = float(os.environ.get("ANTI_FINGER_ROI_PADDING", "0.35"))
+
+# --- Inference Worker ---
+# Run the hand-landmark model in a separate process, frames passed via shared memory
+INFERENCE_WORKER = os.environ.get("ANTI_FINGER_INFERENCE_WORKER", "0") == "1"
+
+# --- Adaptive Inference Cadence ---
+# Lower the inference rate while a matched pose is held still
+ADAPTIVE_CADENCE = os.environ.get("ANTI_FINGER_ADAPTIVE", "0") == "1"
+# While stable, run inference on one captured frame in this many
+STABLE_INTERVAL = int(os.environ.get("ANTI_FINGER_STABLE_INTERVAL", "4"))
+
+# --- Tracing ---
+# Path of a Chrome-trace JSON file to write on exit; empty disables tracing
+TRACE_FILE = os.environ.get("ANTI_FINGER_TRACE", "")
+
+# --- Exercise Log ---
+# History file appended to on every successful pose
+LOG_FILE = os.environ.get("ANTI_FINGER_LOG", "Anti-Finger.txt")
+# When writes reach the disk: "always" (every batch), "interval" or "never" (left to the OS)
+LOG_FSYNC = os.environ.get("ANTI_FINGER_LOG_FSYNC", "interval")
+# Longest time (seconds) a written line may wait for fsync under the "interval" policy
+LOG_FSYNC_INTERVAL = float(os.environ.get("ANTI_FINGER_LOG_FSYNC_INTERVAL", "1.0"))
+
+# --- History Store ---
+# SQLite database of pose events and daily totals; empty keeps history in the text log only
+HISTORY_DB = os.environ.get("ANTI_FINGER_HISTORY_DB", "history.db")
+# Keep appending to the text log as a mirror of the store
+LOG_MIRROR = os.environ.get("ANTI_FINGER_LOG_MIRROR", "1") == "1"
+
+# --- Patient Profiles ---
+# Directory holding profiles.json and one history shard per patient
+PROFILES_DIR = os.environ.get("ANTI_FINGER_PROFILES_DIR", "profiles")
@@ -0,0 +1,98 @@
+"""Streaming clean-up of the per-frame finger angles before classification.
+
+All state is a few fixed-size arrays, so every update is O(1).
+"""
+import math
+import numpy as np
+
+
+def _alpha(cutoff, dt):
+    tau = 1.0 / (2 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """One-Euro low-pass filter over a vector of values (Casiez et al., CHI 2012).
+
+    Slow movement is smoothed hard (cutoff near min_cutoff) to remove jitter. Fast
+    movement raises the cutoff by beta * speed, so real pose changes are not lagged.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.05, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        self.x = None
+        self.dx = None
+        self.t = None
+
+    def __call__(self, x, t):
+        x = np.asarray(x, dtype=np.float64)
+        if self.x is None:
+            self.x = x
+            self.dx = np.zeros_like(x)
+            self.t = t
+            return self.x
+        if t <= self.t:
+            return self.x
+        dt = t - self.t
+        dx = (x - self.x) / dt
+        a_d = _alpha(self.d_cutoff, dt)
+        self.dx = a_d * dx + (1 - a_d) * self.dx
+        cutoff = self.min_cutoff + self.beta * np.abs(self.dx)
+        tau = 1.0 / (2 * np.pi * cutoff)
+        a = 1.0 / (1.0 + tau / dt)
+        self.x = a * x + (1 - a) * self.x
+        self.t = t
+        return self.x
+
+
+class AngleFilter:
+    """Smooths the five finger angles and bridges short detection dropouts.
+
+    When a frame has no hand, the angles are predicted from the last filtered value
+    and its velocity for up to max_gap seconds. A single missed detection then does
+    not end the hold.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.05, max_gap=0.3):
+        self.filter = OneEuroFilter(min_cutoff=min_cutoff, beta=beta)
+        self.max_gap = max_gap
+        self.bridged = 0
+        self.dropouts = 0
+
+    def update(self, angles, t):
+        """Filtered angles as a tuple, or None once a dropout outlasts max_gap"""
+        if angles is not None:
+            return tuple(self.filter(angles, t).tolist())
+        if self.filter.x is None:
+            return None
+        gap = t - self.filter.t
+        if gap > self.max_gap:
+            self.dropouts += 1
+            self.filter.reset()
+            return None
+        self.bridged += 1
+        predicted = np.clip(self.filter.x + self.filter.dx * gap, 0.0, 180.0)
+        return tuple(predicted.tolist())
+
+
+class MatchHysteresis:
+    """Enter a pose only when every finger is inside its range. Leave it only when
+    a finger is more than band degrees outside, so jitter at an edge cannot flicker."""
+
+    def __init__(self, band=5.0):
+        self.band = band
+        self.pose = None
+
+    def update(self, classifier, margins, pose_id):
+        tolerance = self.band if self.pose == pose_id else 0.0
+        matched = classifier.matches(margins, pose_id, tolerance)
+        self.pose = pose_id if matched else None
+        return matched
+
+    def reset(self):
+        self.pose = None
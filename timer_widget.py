@@ -0,0 +1,92 @@
+import time
+
+
+class AnimationClock:
+    """One after() loop shared by every running animation.
+
+    Callbacks get the perf_counter() time of the tick and return True to keep
+    running. The loop stops when no animation is left.
+    """
+
+    def __init__(self, widget, interval_ms=50):
+        self.widget = widget
+        self.interval_ms = interval_ms
+        self._callbacks = {}
+        self._job = None
+
+    def add(self, name, callback):
+        self._callbacks[name] = callback
+        if self._job is None:
+            self._job = self.widget.after(0, self._tick)
+
+    def remove(self, name):
+        self._callbacks.pop(name, None)
+        if not self._callbacks and self._job is not None:
+            try:
+                self.widget.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def _tick(self):
+        now = time.perf_counter()
+        for name, callback in list(self._callbacks.items()):
+            try:
+                keep = callback(now)
+            except Exception as e:
+                print(f"[Animation] {name}: {e}")
+                keep = False
+            if not keep and self._callbacks.get(name) is callback:
+                del self._callbacks[name]
+        self._job = self.widget.after(self.interval_ms, self._tick) if self._callbacks else None
+
+
+class TimerRing:
+    """Timer ring whose canvas items are created once and then only reconfigured.
+
+    A full circle (oval) shows the idle state, an arc shows progress. Each setter
+    skips the Tk call when nothing visible changed.
+    """
+
+    def __init__(self, canvas, size, pad, font, text_color, width=10):
+        self.canvas = canvas
+        l = pad
+        r = size - pad
+        center = size // 2
+        self.oval = canvas.create_oval(l, l, r, r, width=width, outline="")
+        self.arc = canvas.create_arc(l, l, r, r, start=-90, extent=0, style="arc", width=width, outline="", state="hidden")
+        self.text = canvas.create_text(center, center, text="", font=font, fill=text_color)
+        self._mode = None
+        self._color = None
+        self._extent = None
+        self._label = None
+
+    def _set_mode(self, mode):
+        if mode != self._mode:
+            self.canvas.itemconfigure(self.oval, state="normal" if mode == "full" else "hidden")
+            self.canvas.itemconfigure(self.arc, state="normal" if mode == "arc" else "hidden")
+            self._mode = mode
+            self._color = None
+
+    def show_full(self, color):
+        self._set_mode("full")
+        if color != self._color:
+            self.canvas.itemconfigure(self.oval, outline=color)
+            self._color = color
+
+    def show_arc(self, extent, color):
+        self._set_mode("arc")
+        # Half a degree is below what the ring can show at this size
+        extent = round(extent * 2) / 2
+        if color != self._color:
+            self.canvas.itemconfigure(self.arc, outline=color)
+            self._color = color
+        if extent != self._extent:
+            self.canvas.itemconfigure(self.arc, extent=-extent)
+            self._extent = extent
+
+    def set_text(self, value):
+        label = str(value)
+        if label != self._label:
+            self.canvas.itemconfigure(self.text, text=label)
+            self._label = label
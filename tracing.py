@@ -0,0 +1,117 @@
+"""Opt-in span tracing exported in the Chrome trace event format.
+
+The output opens in chrome://tracing, https://ui.perfetto.dev or speedscope.
+When tracing is off every hook is a single attribute check.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        self.tracer._record({
+            "name": self.name, "cat": self.cat, "ph": "X",
+            "ts": self.tracer._us(self.start), "dur": (end - self.start) * 1e6,
+            "args": self.args,
+        })
+        return False
+
+
+class Tracer:
+    def __init__(self, max_events=500000):
+        self.enabled = False
+        self.path = None
+        self.pid = os.getpid()
+        self._events = deque(maxlen=max_events)
+        self._threads = {}
+        self._origin = time.perf_counter()
+
+    def start(self, path):
+        self.path = path
+        self._origin = time.perf_counter()
+        self._events.clear()
+        self._threads.clear()
+        self.enabled = True
+
+    def _us(self, t):
+        return (t - self._origin) * 1e6
+
+    def _record(self, event):
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        event["pid"] = self.pid
+        event["tid"] = tid
+        self._events.append(event)
+
+    def span(self, name, cat="app", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def complete(self, name, start, cat="app", **args):
+        """Record a span that began at perf_counter() value start and ends now"""
+        if self.enabled:
+            end = time.perf_counter()
+            self._record({"name": name, "cat": cat, "ph": "X", "ts": self._us(start),
+                          "dur": (end - start) * 1e6, "args": args})
+
+    def instant(self, name, cat="app", **args):
+        if self.enabled:
+            self._record({"name": name, "cat": cat, "ph": "i", "s": "t",
+                          "ts": self._us(time.perf_counter()), "args": args})
+
+    def counter(self, name, **values):
+        if self.enabled:
+            self._record({"name": name, "ph": "C", "ts": self._us(time.perf_counter()), "args": values})
+
+    def traced(self, name=None, cat="ui"):
+        """Decorator recording a span around every call of the wrapped function"""
+        def decorator(fn):
+            label = name or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with _Span(self, label, cat, {}):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def save(self, path=None):
+        path = path or self.path
+        if not path:
+            return
+        events = list(self._events)
+        meta = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in list(self._threads.items())
+        ]
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp_path, path)
+
+
+tracer = Tracer()